@@ -1,20 +1,150 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
 import base64
-from github import Github
+from github import Github, GithubException
+from github.Repository import Repository
 import markdown
 import re
 from pathlib import Path
 import datetime
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Import the database module via config manager
 from db_config import *
+import repo_cache
+import json_codec
+from rate_limiter import limiter
+from app_secrets import read_secret
+
+# GitHub REST and GraphQL API endpoints
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# GitHub repository URL (https, http, bare host or SSH form)
+_GITHUB_URL_RE = re.compile(r"(?:https?:\/\/)?(?:www\.)?github\.com[\/:]([^\/]+)\/([^\/\s\?#]+)")
+
+# Characters that end the repository name in a URL; such URLs take the regex path
+_URL_STOP_CHARS = frozenset("?# \t\r\n")
+
+# Setting that enables the API cache mode selector. Modes other than
+# "enabled" (notably replay, which serves stored responses without asking
+# GitHub) are for development only
+CACHE_DEV_FLAG = "REPOSPOTLIGHT_CACHE_DEV"
+
+# Number of repositories shown per page in tile view
+PAGE_SIZE = 30
+
+# Number of repositories fetched concurrently by "Refresh All"
+REFRESH_WORKERS = 8
+
+# Repositories synced more recently than this (in seconds) are not refetched
+# by the tile/list Refresh buttons unless "Force refresh" is enabled
+MIN_REFRESH_INTERVAL = 60
+
+# Connections kept open to the GitHub API (at least one per refresh worker)
+HTTP_POOL_SIZE = 16
+
+# Fields of the stored GitHub data that the detail view renders; rows
+# missing any of them (partial or older formats) use the basic view
+DETAIL_FIELDS = (
+    "name", "description", "stars", "forks", "watchers", "language", "issues",
+    "created_at", "updated_at", "topics", "html_url", "custom_metadata", "owner"
+)
+DETAIL_OWNER_FIELDS = ("login", "avatar_url", "html_url")
+
+# Possible locations of the project metadata file, in order of preference
+METADATA_PATHS = [
+    ".github/project_metadata.json",
+    "project_metadata.json",
+    "docs/project_metadata.json",
+    ".metadata/project.json"
+]
+
+# Everything shown for a repository, fetched in a single GraphQL request
+REPO_GRAPHQL_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    name
+    nameWithOwner
+    description
+    stargazerCount
+    forkCount
+    watchers { totalCount }
+    primaryLanguage { name }
+    issues(states: OPEN) { totalCount }
+    createdAt
+    updatedAt
+    url
+    owner { login avatarUrl url }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    readme: object(expression: "HEAD:README.md") { ... on Blob { text } }
+    readmePlain: object(expression: "HEAD:README") { ... on Blob { text } }
+    METADATA_FIELDS
+    defaultBranchRef {
+      name
+      target {
+        ... on Commit {
+          history(first: 5) {
+            nodes { oid messageHeadline url author { name date } }
+          }
+        }
+      }
+    }
+  }
+}
+""".replace("METADATA_FIELDS", "\n    ".join(
+    f'metadata{i}: object(expression: "HEAD:{path}") {{ ... on Blob {{ text }} }}'
+    for i, path in enumerate(METADATA_PATHS)
+))
+
+@st.cache_resource
+def get_http_session():
+    """Shared HTTP session for direct GitHub REST calls"""
+    session = requests.Session()
+    # Keep connections to api.github.com open so fetches reuse TCP+TLS
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    )
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource
+def get_gh_client(access_token=""):
+    """Shared PyGithub client per token, with a connection pool reused across reruns"""
+    return Github(
+        access_token or None,
+        retry=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+        pool_size=HTTP_POOL_SIZE,
+        # Request pacing is handled by the shared rate limiter
+        seconds_between_requests=None
+    )
+
+def github_headers(access_token=""):
+    """Build the request headers for the GitHub REST API"""
+    headers = {"Accept": "application/vnd.github+json"}
+    if access_token:
+        headers["Authorization"] = f"token {access_token}"
+    return headers
 
 # Initialize database if needed
+@st.cache_resource(show_spinner=False)
 def ensure_db_initialized():
-    """Make sure the database is initialized properly"""
+    """
+    Make sure the database is initialized properly
+    
+    Cached as a resource so it runs once per server process rather than on
+    every rerun (a module-level flag would not survive Streamlit re-executing
+    this script).
+    """
     try:
         # Check if the database initialization function exists and call it
         if hasattr(db, 'init_db'):
@@ -35,14 +165,249 @@ def ensure_db_initialized():
                     )
                     ''')
                     conn.commit()
-                conn.close()
+                db.safe_close(conn)
     except Exception as e:
         st.warning(f"Database check notice: {str(e)}")
 
+def fetch_readme_rest(owner, repo_name, access_token, cache_mode):
+    """
+    Fetch the README text with the REST readme endpoint (through repo_cache)
+    
+    GitHub resolves the README wherever it is (any case or extension, docs/
+    or .github/), which the GraphQL query's fixed paths cannot.
+    """
+    def fetch():
+        limiter.acquire()
+        headers = github_headers(access_token)
+        headers["Accept"] = "application/vnd.github.raw+json"
+        response = get_http_session().get(
+            f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/readme", headers=headers, timeout=15
+        )
+        if response.status_code == 404:
+            return "No README found"
+        response.raise_for_status()
+        return response.text
+    
+    return repo_cache.cached(
+        repo_cache.cache_key(owner, repo_name, "readme", access_token),
+        repo_cache.DEFAULT_TTL, fetch, cache_mode
+    )
+
+def graphql_fetch(owner, repo_name, access_token, cache_mode=repo_cache.DEFAULT_MODE):
+    """
+    Fetch repository data with a single GitHub GraphQL query
+    
+    The README is read from HEAD:README.md or HEAD:README; other locations
+    fall back to the REST readme endpoint.
+    
+    Returns:
+        The repository data dict, or None if the query failed
+    """
+    try:
+        limiter.acquire()
+        response = get_http_session().post(
+            GITHUB_GRAPHQL_URL,
+            json={"query": REPO_GRAPHQL_QUERY, "variables": {"owner": owner, "name": repo_name}},
+            headers=github_headers(access_token),
+            timeout=15
+        )
+        payload = response.json() if response.status_code == 200 else {}
+    except (requests.RequestException, ValueError) as e:
+        st.warning(f"GraphQL request failed: {str(e)}")
+        return None
+    
+    repo = (payload.get("data") or {}).get("repository")
+    if payload.get("errors") or not repo:
+        return None
+    
+    # First metadata location that exists and parses
+    metadata = {}
+    for i, path in enumerate(METADATA_PATHS):
+        blob = repo.get(f"metadata{i}")
+        if not blob or blob.get("text") is None:
+            continue
+        try:
+            metadata = json.loads(blob["text"])
+            st.success(f"Found metadata at {path}")
+            break
+        except ValueError:
+            continue
+    
+    readme_text = (repo.get("readme") or repo.get("readmePlain") or {}).get("text")
+    if readme_text is None:
+        readme_text = fetch_readme_rest(owner, repo_name, access_token, cache_mode)
+    branch = repo.get("defaultBranchRef") or {}
+    history = ((branch.get("target") or {}).get("history") or {}).get("nodes", [])
+    
+    return {
+        "name": repo["name"],
+        "full_name": repo["nameWithOwner"],
+        "description": repo["description"],
+        "stars": repo["stargazerCount"],
+        "forks": repo["forkCount"],
+        "watchers": repo["watchers"]["totalCount"],
+        "language": (repo.get("primaryLanguage") or {}).get("name"),
+        "issues": repo["issues"]["totalCount"],
+        "created_at": repo["createdAt"][:10],
+        "updated_at": repo["updatedAt"][:10],
+        "readme": readme_text or "No README found",
+        "owner": {
+            "login": repo["owner"]["login"],
+            "avatar_url": repo["owner"]["avatarUrl"],
+            "html_url": repo["owner"]["url"]
+        },
+        "html_url": repo["url"],
+        "topics": [node["topic"]["name"] for node in repo["repositoryTopics"]["nodes"]],
+        "custom_metadata": metadata,
+        "recent_commits": [
+            {
+                "sha": node["oid"][:7],  # First 7 chars of commit hash
+                "message": node["messageHeadline"],
+                "author": (node.get("author") or {}).get("name"),
+                "date": ((node.get("author") or {}).get("date") or "")[:10],
+                "url": node["url"]
+            }
+            for node in history
+        ],
+        "default_branch": branch.get("name")
+    }
+
+def rest_fetch(repo, owner, repo_name, access_token, cache_mode):
+    """
+    Build repository data from the GitHub REST API using PyGithub
+    """
+    ttl = repo_cache.DEFAULT_TTL
+    
+    def fetch_readme():
+        try:
+            limiter.acquire()
+            return repo.get_readme().decoded_content.decode("utf-8")
+        except GithubException as e:
+            if e.status != 404:
+                raise
+            return "No README found"
+    
+    # Get README content
+    readme_content = repo_cache.cached(
+        repo_cache.cache_key(owner, repo_name, "readme", access_token), ttl, fetch_readme, cache_mode
+    )
+    
+    # Check for project metadata in possible locations
+    metadata = {}
+    
+    def fetch_top_level_paths():
+        try:
+            limiter.acquire()
+            tree = repo.get_git_tree(repo.default_branch, recursive=False)
+            return [element.path for element in tree.tree]
+        except GithubException as e:
+            # 409 means the repository is empty; probe every location then
+            if e.status not in (404, 409):
+                raise
+            return None
+    
+    # One tree listing tells us which candidate locations can exist at all
+    top_level_paths = repo_cache.cached(
+        repo_cache.cache_key(owner, repo_name, "tree", access_token), ttl, fetch_top_level_paths, cache_mode
+    )
+    if top_level_paths is not None:
+        top_level_paths = set(top_level_paths)
+    
+    def fetch_contents(path):
+        try:
+            limiter.acquire()
+            contents = repo.get_contents(path)
+        except GithubException as e:
+            if e.status != 404:
+                raise
+            return None
+        # A directory listing comes back as a list; only a file can be metadata
+        if isinstance(contents, list):
+            return None
+        return contents.decoded_content.decode("utf-8")
+    
+    for path in METADATA_PATHS:
+        # Skip locations whose top-level file or directory is not in the tree
+        if top_level_paths is not None and path.split("/", 1)[0] not in top_level_paths:
+            continue
+        metadata_text = repo_cache.cached(
+            repo_cache.cache_key(owner, repo_name, f"contents/{path}", access_token), ttl,
+            lambda: fetch_contents(path), cache_mode
+        )
+        if metadata_text is None:
+            # Try next location
+            continue
+        try:
+            metadata = json.loads(metadata_text)
+            st.success(f"Found metadata at {path}")
+            break
+        except ValueError:
+            continue
+    
+    # Get recent commits; a failure is not cached (None marks the result
+    # as partial so get_repo_info doesn't store it either)
+    try:
+        recent_commits = repo_cache.cached(
+            repo_cache.cache_key(owner, repo_name, "commits", access_token), ttl,
+            lambda: get_recent_commits(owner, repo_name, access_token), cache_mode
+        )
+    except (requests.RequestException, ValueError, KeyError) as e:
+        st.warning(f"Could not fetch commits: {str(e)}")
+        recent_commits = None
+    
+    def fetch_topics():
+        limiter.acquire()
+        return repo.get_topics()
+    
+    # Get repository topics
+    topics = repo_cache.cached(
+        repo_cache.cache_key(owner, repo_name, "topics", access_token), ttl, fetch_topics, cache_mode
+    )
+    
+    # Get repository data
+    repo_data = {
+        "name": repo.name,
+        "full_name": repo.full_name,
+        "description": repo.description,
+        "stars": repo.stargazers_count,
+        "forks": repo.forks_count,
+        "watchers": repo.watchers_count,
+        "language": repo.language,
+        "issues": repo.open_issues_count,
+        "created_at": repo.created_at.date().isoformat(),
+        "updated_at": repo.updated_at.date().isoformat(),
+        "readme": readme_content,
+        "owner": {
+            "login": repo.owner.login,
+            "avatar_url": repo.owner.avatar_url,
+            "html_url": repo.owner.html_url
+        },
+        "html_url": repo.html_url,
+        "topics": topics,
+        "custom_metadata": metadata,
+        "recent_commits": recent_commits,
+        "default_branch": repo.default_branch
+    }
+    
+    return repo_data
+
+class RepoFetchError(Exception):
+    """A repository could not be fetched; hint is extra guidance for the user"""
+    
+    def __init__(self, message, hint=None):
+        super().__init__(message)
+        self.hint = hint
+
 # Function to get repository information
-def get_repo_info(repo_url):
+@st.cache_data(ttl=300, max_entries=256, show_spinner=False)
+def get_repo_info(repo_url, access_token="", cache_mode=repo_cache.DEFAULT_MODE, refresh_nonce=0):
     """
     Extract and return information from a GitHub repository
+    
+    Results are memoized per (repo_url, access_token, cache_mode,
+    refresh_nonce) so reruns don't hit GitHub again; a new refresh_nonce
+    refetches that repository only. Failures raise (RepoFetchError or the
+    underlying error) so they are never memoized.
     """
     # Normalize the URL to handle various formats
     # Remove trailing slash, .git extension, and any query parameters
@@ -56,160 +421,245 @@ def get_repo_info(repo_url):
     # - http://github.com/username/repo
     # - github.com/username/repo
     # - git@github.com:username/repo.git
-    pattern = r"(?:https?:\/\/)?(?:www\.)?github\.com[\/:]([^\/]+)\/([^\/\s\?#]+)"
-    match = re.search(pattern, repo_url)
+    parts = None
+    if repo_url.startswith("https://github.com/"):
+        # Fast path for the common URL shape
+        parts = repo_url[len("https://github.com/"):].split("/")
+    if parts and len(parts) >= 2 and parts[0] and parts[1] and _URL_STOP_CHARS.isdisjoint(parts[1]):
+        owner, repo_name = parts[0], parts[1]
+    else:
+        match = _GITHUB_URL_RE.search(repo_url)
+        
+        if not match:
+            raise RepoFetchError(
+                "Invalid GitHub repository URL",
+                "URL should be in format: github.com/username/repository"
+            )
+        
+        owner = match.group(1)
+        repo_name = match.group(2)
     
-    if not match:
-        st.error("Invalid GitHub repository URL")
-        st.info("URL should be in format: github.com/username/repository")
-        return None
+    # Previously stored repository data and the ETag it was fetched with
+    repo_key = repo_cache.cache_key(owner, repo_name, "repo", access_token)
+    cached_entry = repo_cache.lookup(repo_key) if cache_mode != "disabled" else None
+    if cached_entry and cache_mode == "replay":
+        return cached_entry[0]
     
-    owner = match.group(1)
-    repo_name = match.group(2)
+    # Conditional request: GitHub answers 304 (free of rate limit) if unchanged
+    headers = github_headers(access_token)
+    if cached_entry and cached_entry[2]:
+        headers["If-None-Match"] = cached_entry[2]
+    limiter.acquire()
+    response = get_http_session().get(
+        f"{GITHUB_API_URL}/repos/{owner}/{repo_name}", headers=headers, timeout=15
+    )
     
-    # GitHub access token (optional)
-    access_token = st.session_state.get("github_token", "")
+    if response.status_code == 304 and cached_entry:
+        return cached_entry[0]
+    if response.status_code == 404:
+        raise RepoFetchError(
+            f"Repository not found: {owner}/{repo_name}",
+            "Make sure the repository exists and is spelled correctly."
+        )
+    if response.status_code == 403:
+        raise RepoFetchError(
+            "API rate limit exceeded",
+            "Consider adding a GitHub token to increase your rate limit."
+        )
+    if response.status_code != 200:
+        raise RepoFetchError(f"Error accessing repository: HTTP {response.status_code}")
     
-    try:
-        if access_token:
-            g = Github(access_token)
-        else:
-            g = Github()
-        
-        try:    
-            repo = g.get_repo(f"{owner}/{repo_name}")
-        except Exception as e:
-            if "404" in str(e):
-                st.error(f"Repository not found: {owner}/{repo_name}")
-                st.info("Make sure the repository exists and is spelled correctly.")
-                return None
-            elif "403" in str(e):
-                st.error("API rate limit exceeded")
-                st.info("Consider adding a GitHub token to increase your rate limit.")
-                return None
-            else:
-                st.error(f"Error accessing repository: {str(e)}")
-                return None
-        
-        # Get README content
-        try:
-            readme_content = repo.get_readme().decoded_content.decode("utf-8")
-        except Exception as e:
-            readme_content = "No README found"
-        
-        # Check for project metadata in possible locations
-        metadata = {}
-        metadata_paths = [
-            ".github/project_metadata.json",
-            "project_metadata.json",
-            "docs/project_metadata.json",
-            ".metadata/project.json"
-        ]
-        
-        for path in metadata_paths:
-            try:
-                metadata_content = repo.get_contents(path)
-                metadata = json.loads(metadata_content.decoded_content.decode("utf-8"))
-                st.success(f"Found metadata at {path}")
-                break
-            except:
-                # Try next location
-                continue
-        
-        # Get recent commits
-        recent_commits = get_recent_commits(repo)
-        
-        # Get repository data
-        repo_data = {
-            "name": repo.name,
-            "full_name": repo.full_name,
-            "description": repo.description,
-            "stars": repo.stargazers_count,
-            "forks": repo.forks_count,
-            "watchers": repo.watchers_count,
-            "language": repo.language,
-            "issues": repo.open_issues_count,
-            "created_at": repo.created_at.strftime("%Y-%m-%d"),
-            "updated_at": repo.updated_at.strftime("%Y-%m-%d"),
-            "readme": readme_content,
-            "owner": {
-                "login": repo.owner.login,
-                "avatar_url": repo.owner.avatar_url,
-                "html_url": repo.owner.html_url
-            },
-            "html_url": repo.html_url,
-            "topics": repo.get_topics(),
-            "custom_metadata": metadata,
-            "recent_commits": recent_commits,
-            "default_branch": repo.default_branch
-        }
+    repo_data = None
+    if access_token:
+        # A single GraphQL query replaces the README, metadata, commit and topic calls
+        repo_data = graphql_fetch(owner, repo_name, access_token, cache_mode)
+    
+    if repo_data is None:
+        # The GraphQL API requires a token; otherwise fall back to the REST endpoints
+        g = get_gh_client(access_token)
+        repo = g.create_from_raw_data(Repository, response.json(), dict(response.headers))
+        repo_data = rest_fetch(repo, owner, repo_name, access_token, cache_mode)
+    
+    # Remember the full result so an unchanged repository costs a single 304;
+    # a partial result (commits unavailable) is not stored so it is retried
+    complete = repo_data["recent_commits"] is not None
+    if not complete:
+        repo_data["recent_commits"] = []
+    if complete and cache_mode not in ("read-only", "disabled"):
+        repo_cache.store(repo_key, repo_data, response.headers.get("ETag"))
+    
+    return repo_data
+
+def cache_dev_enabled():
+    """Whether the API cache mode selector is enabled (see CACHE_DEV_FLAG)"""
+    return str(read_secret(CACHE_DEV_FLAG)).lower() in ("1", "true")
+
+def refresh_nonce(repo_url, bump=False):
+    """
+    This session's refresh_nonce for a repository (see get_repo_info)
+    
+    Args:
+        repo_url: The GitHub repository URL
+        bump: Start a new nonce so the repository's memoized result is skipped
+    """
+    nonces = st.session_state.setdefault("refresh_nonces", {})
+    if bump:
+        nonces[repo_url] = time.time_ns()
+    return nonces.get(repo_url, 0)
+
+def fetch_repo_info(repo_url, refresh=False):
+    """
+    Get repository information using this session's GitHub token and cache mode
+    
+    Args:
+        repo_url: The GitHub repository URL
+        refresh: Skip this repository's memoized result so GitHub is queried again
         
-        return repo_data
+    Returns:
+        The repository data, or None (after showing the error) if it could
+        not be fetched
+    """
+    try:
+        return get_repo_info(
+            repo_url,
+            st.session_state.get("github_token", ""),
+            st.session_state.get("cache_mode", repo_cache.DEFAULT_MODE) if cache_dev_enabled()
+            else repo_cache.DEFAULT_MODE,
+            refresh_nonce(repo_url, bump=refresh)
+        )
+    except RepoFetchError as e:
+        st.error(str(e))
+        if e.hint:
+            st.info(e.hint)
     except Exception as e:
         st.error(f"Error fetching repository: {str(e)}")
-        return None
+    return None
 
 # Function to convert markdown to HTML
 def md_to_html(md_text):
     """Convert markdown text to HTML"""
     return markdown.markdown(md_text, extensions=['tables', 'fenced_code'])
 
+# Project metadata template, serialized once at import
+_METADATA_TEMPLATE_JSON = json.dumps({
+    "project_name": "Your Project Name",
+    "tagline": "A short catchy description",
+    "showcase_image": "URL to main project image",
+    "demo_url": "URL to live demo if available",
+    "documentation_url": "URL to project documentation",
+    "features": [
+        "Key feature 1",
+        "Key feature 2",
+        "Key feature 3"
+    ],
+    "tech_stack": [
+        "Technology 1",
+        "Technology 2",
+        "Technology 3"
+    ],
+    "contact": {
+        "email": "contact@example.com",
+        "twitter": "your_twitter_handle",
+        "linkedin": "your_linkedin_profile"
+    },
+    "contributors": [
+        {
+            "name": "Contributor Name",
+            "github": "github_username",
+            "role": "Role in project"
+        }
+    ]
+}, indent=2)
+
 # Function to generate project metadata template
 def generate_metadata_template():
     """Generate a template for project metadata"""
-    template = {
-        "project_name": "Your Project Name",
-        "tagline": "A short catchy description",
-        "showcase_image": "URL to main project image",
-        "demo_url": "URL to live demo if available",
-        "documentation_url": "URL to project documentation",
-        "features": [
-            "Key feature 1",
-            "Key feature 2",
-            "Key feature 3"
-        ],
-        "tech_stack": [
-            "Technology 1",
-            "Technology 2",
-            "Technology 3"
-        ],
-        "contact": {
-            "email": "contact@example.com",
-            "twitter": "your_twitter_handle",
-            "linkedin": "your_linkedin_profile"
-        },
-        "contributors": [
-            {
-                "name": "Contributor Name",
-                "github": "github_username",
-                "role": "Role in project"
-            }
-        ]
-    }
-    return json.dumps(template, indent=2)
+    return _METADATA_TEMPLATE_JSON
 
 # Function to get recent commits
-def get_recent_commits(repo, limit=5):
-    """Fetch recent commits from the repository"""
-    try:
-        commits = repo.get_commits()
-        recent_commits = []
+def get_recent_commits(owner, repo_name, access_token="", limit=5):
+    """
+    Fetch recent commits from the repository
+    
+    Raises:
+        requests.RequestException, ValueError, KeyError: If the commits could
+            not be fetched or parsed (raised rather than returning [] so
+            the failure is not cached)
+    """
+    # Ask for exactly 'limit' commits instead of slicing a 30-item page
+    limiter.acquire()
+    response = get_http_session().get(
+        f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/commits",
+        params={"per_page": limit},
+        headers=github_headers(access_token),
+        timeout=15
+    )
+    response.raise_for_status()
+    
+    # Build the whole list in one comprehension
+    return [
+        {
+            "sha": item["sha"][:7],  # First 7 chars of commit hash
+            "message": item["commit"]["message"].partition("\n")[0],  # First line of commit message
+            "author": item["commit"]["author"]["name"],
+            "date": item["commit"]["author"]["date"][:10],
+            "url": item["html_url"]
+        }
+        for item in response.json()
+    ]
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_repositories():
+    """
+    Get all repositories from the database, memoized across reruns
+    
+    Call load_repositories.clear() after adding, updating or deleting a repository.
+    """
+    return get_all_repositories()
+
+def seconds_since_sync(last_synced):
+    """Seconds elapsed since a stored last_synced Unix timestamp, or None if unknown"""
+    if not last_synced:
+        return None
+    return time.time() - last_synced
+
+def format_sync_time(last_synced):
+    """Format a stored last_synced Unix timestamp for display"""
+    if not last_synced:
+        return "never"
+    return datetime.datetime.fromtimestamp(last_synced).strftime("%Y-%m-%d %H:%M:%S")
+
+def refresh_repository(repo, force=False):
+    """
+    Refetch a stored repository from GitHub and update the database
+    
+    Args:
+        repo: Repository row from the database
+        force: Refetch even if the repository was synced moments ago
         
-        # Get first 'limit' commits
-        for commit in commits[:limit]:
-            commit_data = {
-                "sha": commit.sha[:7],  # First 7 chars of commit hash
-                "message": commit.commit.message.split("\n")[0],  # First line of commit message
-                "author": commit.commit.author.name,
-                "date": commit.commit.author.date.strftime("%Y-%m-%d"),
-                "url": commit.html_url
-            }
-            recent_commits.append(commit_data)
-            
-        return recent_commits
-    except Exception as e:
-        st.warning(f"Could not fetch commits: {str(e)}")
-        return []
+    Returns:
+        bool: True if the repository was updated
+    """
+    if not force:
+        age = seconds_since_sync(repo.get("last_synced"))
+        if age is not None and age < MIN_REFRESH_INTERVAL:
+            st.info(f"Recently synced: {repo['name']}")
+            return False
+    
+    with st.spinner("Refreshing..."):
+        repo_data = fetch_repo_info(repo["repo_url"], refresh=True)
+        if repo_data and update_repository(repo["repo_url"], repo_data):
+            load_repositories.clear()
+            st.success(f"Refreshed: {repo['name']}")
+            return True
+    return False
+
+def has_detail_fields(repo_data):
+    """Check that stored GitHub data has every field the detail view renders"""
+    if not isinstance(repo_data, dict) or not all(key in repo_data for key in DETAIL_FIELDS):
+        return False
+    owner = repo_data["owner"]
+    return isinstance(owner, dict) and all(key in owner for key in DETAIL_OWNER_FIELDS)
 
 def show_repository_detail(repo_url):
     """Show detailed view of a repository"""
@@ -221,24 +671,35 @@ def show_repository_detail(repo_url):
     
     if repo_url:
         # Get repository from database
-        db_repo = db.get_repository(repo_url)
+        db_repo = get_repository(repo_url)
         
         if db_repo:
             # Show the last synced date
-            st.caption(f"Last synced: {db_repo['last_synced']}")
+            st.caption(f"Last synced: {format_sync_time(db_repo['last_synced'])}")
             
             # Refresh button
             if st.button("🔄 Refresh Repository Data", key="refresh_detail"):
                 with st.spinner("Refreshing repository data..."):
-                    repo_data = get_repo_info(db_repo["repo_url"])
+                    repo_data = fetch_repo_info(db_repo["repo_url"], refresh=True)
                     if repo_data:
-                        if db.update_repository(db_repo["repo_url"], repo_data):
+                        if update_repository(db_repo["repo_url"], repo_data):
+                            load_repositories.clear()
                             st.success(f"Refreshed: {db_repo['name']}")
                             st.rerun()
         
-            # Try to get fresh data from GitHub
-            with st.spinner("Loading repository data..."):
-                repo_data = get_repo_info(db_repo["repo_url"])
+            # Render the GitHub data stored at the last add/refresh; only the
+            # refresh button above goes to the network
+            repo_data = None
+            if db_repo.get("cached_json"):
+                try:
+                    repo_data = json_codec.loads(db_repo["cached_json"])
+                except ValueError:
+                    repo_data = None
+            if not has_detail_fields(repo_data):
+                repo_data = None
+            if repo_data is not None:
+                # The README is stored compressed next to the JSON and comes back decoded
+                repo_data["readme"] = db_repo.get("readme") or "No README found"
             
             if repo_data:
                 # Layout with columns
@@ -321,10 +782,12 @@ def show_repository_detail(repo_url):
                     
                     # README content
                     st.header("README")
+                    # READMEs come from third-party repositories, so raw HTML
+                    # in them must not be rendered
                     st.markdown(repo_data["readme"])
             else:
-                # Use the database version if GitHub API fails
-                st.warning("Could not fetch fresh data from GitHub. Showing stored data.")
+                # Rows saved before full GitHub data was stored only have the basic fields
+                st.warning("Full GitHub data has not been stored yet. Use Refresh to load it. Showing stored data.")
                 
                 # Display basic repository info from database
                 st.header(db_repo["name"])
@@ -349,12 +812,22 @@ def show_repository_detail(repo_url):
 def display_tile_view(repositories):
     """Display repositories in tile view"""
     if repositories:
+        # Only build widgets for the repositories on the current page
+        page_count = (len(repositories) + PAGE_SIZE - 1) // PAGE_SIZE
+        page = min(st.session_state.get("page", 0), page_count - 1)
+        visible_repos = repositories[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+        
+        # Widget keys for the visible page, built once per render
+        keys = [(f"view_{r['id']}", f"refresh_{r['id']}", f"delete_{r['id']}") for r in visible_repos]
+        
         # Create rows with 3 repositories per row
-        for i in range(0, len(repositories), 3):
-            row_repos = repositories[i:i+3]
+        for i in range(0, len(visible_repos), 3):
             cols = st.columns(3)
             
-            for j, repo in enumerate(row_repos):
+            # Index into the page directly rather than slicing a new list per row
+            for j in range(min(3, len(visible_repos) - i)):
+                repo = visible_repos[i + j]
+                view_key, refresh_key, delete_key = keys[i + j]
                 with cols[j]:
                     with st.container(border=True):
                         # Repository card
@@ -377,28 +850,33 @@ def display_tile_view(repositories):
                         col1, col2, col3 = st.columns(3)
                         
                         # View button
-                        view_key = f"view_{repo['id']}"
                         if col1.button("📖 View", key=view_key):
                             st.session_state["selected_repo"] = repo["repo_url"]
                             st.session_state["view_mode"] = "detail"
                             st.rerun()
                         
                         # Refresh button
-                        refresh_key = f"refresh_{repo['id']}"
                         if col2.button("🔄 Refresh", key=refresh_key):
-                            with st.spinner("Refreshing..."):
-                                repo_data = get_repo_info(repo["repo_url"])
-                                if repo_data:
-                                    if db.update_repository(repo["repo_url"], repo_data):
-                                        st.success(f"Refreshed: {repo['name']}")
-                                        st.rerun()
+                            if refresh_repository(repo, force=st.session_state.get("force_refresh", False)):
+                                st.rerun()
                         
                         # Delete button
-                        delete_key = f"delete_{repo['id']}"
                         if col3.button("🗑️ Delete", key=delete_key):
-                            if db.delete_repository(repo["repo_url"]):
+                            if delete_repository(repo["repo_url"]):
+                                load_repositories.clear()
                                 st.success(f"Deleted: {repo['name']}")
                                 st.rerun()
+        
+        # Page navigation
+        if page_count > 1:
+            prev_col, info_col, next_col = st.columns([1, 2, 1])
+            if prev_col.button("← Previous", key="page_prev", disabled=page == 0):
+                st.session_state["page"] = page - 1
+                st.rerun()
+            info_col.caption(f"Page {page + 1} of {page_count}")
+            if next_col.button("Next →", key="page_next", disabled=page >= page_count - 1):
+                st.session_state["page"] = page + 1
+                st.rerun()
     else:
         st.info("No repositories added yet. Add a GitHub repository URL in the sidebar.")
         
@@ -448,15 +926,12 @@ def display_list_view(repositories):
                         st.rerun()
                     
                     if st.button("🔄 Refresh", key=refresh_key):
-                        with st.spinner("Refreshing..."):
-                            repo_data = get_repo_info(repo["repo_url"])
-                            if repo_data:
-                                if db.update_repository(repo["repo_url"], repo_data):
-                                    st.success(f"Refreshed: {repo['name']}")
-                                    st.rerun()
+                        if refresh_repository(repo, force=st.session_state.get("force_refresh", False)):
+                            st.rerun()
                     
                     if st.button("🗑️ Delete", key=delete_key):
-                        if db.delete_repository(repo["repo_url"]):
+                        if delete_repository(repo["repo_url"]):
+                            load_repositories.clear()
                             st.success(f"Deleted: {repo['name']}")
                             st.rerun()
     else:
@@ -504,6 +979,23 @@ def main():
         if github_token:
             st.session_state["github_token"] = github_token
         
+        # Bypass the recently-synced check on per-repository Refresh buttons
+        st.checkbox(
+            "Force refresh",
+            key="force_refresh",
+            help=f"Refetch even if a repository was synced in the last {MIN_REFRESH_INTERVAL} seconds"
+        )
+        
+        # GitHub API response cache mode (development only)
+        if cache_dev_enabled():
+            st.selectbox(
+                "API Cache Mode",
+                repo_cache.CACHE_MODES,
+                key="cache_mode",
+                help="enabled: reuse recent responses; read-only: never write the cache; "
+                     "replay: always reuse stored responses; disabled: always call GitHub"
+            )
+        
         # Add new repository section
         st.header("Add Repository")
         
@@ -538,10 +1030,10 @@ def main():
         # Technology stats
         st.header("Technology Stats")
         try:
-            tech_stats = db.get_technology_stats()
+            tech_stats = get_technology_stats()
             if tech_stats:
-                for tech in tech_stats:
-                    st.write(f"• {tech['name']}: {tech['count']} projects")
+                # One markdown element instead of one widget per technology
+                st.markdown("\n".join(f"- {tech['name']}: {tech['count']} projects" for tech in tech_stats))
             else:
                 st.info("No technology statistics available yet")
         except Exception as e:
@@ -553,24 +1045,43 @@ def main():
     # Add new repository
     if add_button and new_repo_url:
         with st.spinner("Fetching repository information..."):
-            repo_data = get_repo_info(new_repo_url)
+            repo_data = fetch_repo_info(new_repo_url)
             
             if repo_data:
-                if db.add_repository(new_repo_url, repo_data):
+                if add_repository(new_repo_url, repo_data):
+                    load_repositories.clear()
                     st.success(f"Added repository: {repo_data['name']}")
                     # Force a rerun to update the list
                     st.rerun()
-                else:
+                elif get_repository(new_repo_url):
                     st.warning("Repository already exists in the database")
+                else:
+                    # add_repository logs the underlying error
+                    st.error("Could not save the repository to the database. Check the server logs for details.")
     
     # Refresh all repositories
     if refresh_all:
-        repos = db.get_all_repositories()
+        repos = load_repositories()
         with st.spinner("Refreshing all repositories..."):
+            # New nonces (set here, on the script thread) skip each
+            # repository's memoized result
             for repo in repos:
-                repo_data = get_repo_info(repo["repo_url"])
+                refresh_nonce(repo["repo_url"], bump=True)
+            
+            # Fetch from GitHub concurrently; worker threads share this run's
+            # script context so session state and messages keep working
+            ctx = get_script_run_ctx()
+            with ThreadPoolExecutor(
+                max_workers=REFRESH_WORKERS,
+                initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+            ) as executor:
+                results = list(executor.map(fetch_repo_info, [repo["repo_url"] for repo in repos]))
+            
+            # Write back on this thread to keep database writes single-threaded
+            for repo, repo_data in zip(repos, results):
                 if repo_data:
-                    db.update_repository(repo["repo_url"], repo_data)
+                    update_repository(repo["repo_url"], repo_data)
+            load_repositories.clear()
             st.success("All repositories refreshed")
             # Force a rerun to update all data
             st.rerun()
@@ -581,7 +1092,7 @@ def main():
         show_repository_detail(st.session_state["selected_repo"])
     else:
         # Get repositories from database
-        repositories = db.get_all_repositories()
+        repositories = load_repositories()
         
         # Display repository count and overview
         col1, col2 = st.columns(2)
@@ -0,0 +1,57 @@
+"""
+Secret lookup for RepoSpotlight
+
+Settings are read from environment variables first and Streamlit secrets
+(.streamlit/secrets.toml) second. Secrets are parsed once and memoized for
+the life of the process; outside a running app the TOML files are read
+directly so command-line tools never import streamlit.
+"""
+import functools
+import os
+import sys
+from typing import Any, Dict
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# Secrets files read by Streamlit; later files override earlier ones
+SECRETS_FILES = (
+    os.path.join(os.path.expanduser("~"), ".streamlit", "secrets.toml"),
+    os.path.join(".streamlit", "secrets.toml"),
+)
+
+@functools.lru_cache(maxsize=1)
+def _read_secrets_files() -> Dict[str, Any]:
+    """Parse the secrets files the way Streamlit merges them"""
+    secrets = {}
+    for path in SECRETS_FILES:
+        try:
+            with open(path, "rb") as f:
+                secrets.update(tomllib.load(f))
+        except (OSError, tomllib.TOMLDecodeError):
+            continue
+    return secrets
+
+@functools.lru_cache(maxsize=None)
+def streamlit_secret(name: str) -> Any:
+    """Return a value from Streamlit secrets, or None if it is not set"""
+    # Outside a running app (e.g. the command-line tools) the secrets files
+    # are parsed directly, so streamlit and its dependencies are not imported
+    if "streamlit" not in sys.modules and tomllib is not None:
+        return _read_secrets_files().get(name)
+    
+    import streamlit as st
+    try:
+        return st.secrets.get(name)
+    except Exception:
+        # No secrets file, or one that cannot be parsed
+        return None
+
+def read_secret(name: str) -> Any:
+    """Return a setting from the environment or Streamlit secrets (None if unset)"""
+    return os.environ.get(name) or streamlit_secret(name)
@@ -1,9 +1,20 @@
 import sqlite3
+import atexit
+import threading
+import queue
 import os
-import json
-from typing import List, Dict, Any, Optional
-import datetime
+import json_codec
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import time
+import zlib
+import functools
+from collections import Counter, namedtuple
+from read_cache import ReadCache, ALL_REPOSITORIES
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 # Database file path
 DB_PATH = "github_projects.db"
@@ -11,75 +22,359 @@ DB_PATH = "github_projects.db"
 # Database lock timeout (in seconds)
 DB_TIMEOUT = 20.0
 
+# Pooled connections keyed by the thread that owns them (see get_db_connection)
+_connections = {}
+_connections_lock = threading.Lock()
+
+# Queued technology count changes, applied by a single writer thread in
+# batches of up to TECH_BATCH_SIZE gathered over TECH_BATCH_WAIT seconds
+_tech_queue = queue.Queue()
+TECH_BATCH_SIZE = 100
+TECH_BATCH_WAIT = 0.05
+
+# Process-local cache for repository reads (entries expire after 60 seconds)
+_read_cache = ReadCache(ttl=60.0)
+
+# First byte of metadata stored as MessagePack (JSON text never starts with it)
+METADATA_MSGPACK_PREFIX = b"\x01"
+
+# repo_data keys stored compressed in readme_blob instead of cached_json
+README_KEYS = ("readme",)
+
+def pack_repo_data(repo_data: Dict[str, Any]):
+    """
+    Split repository data for storage
+    
+    Returns:
+        (cached_json, readme_blob): the JSON text without the README fields,
+        and the README fields as level-1 zlib-compressed JSON
+    """
+    readme = {key: repo_data[key] for key in README_KEYS if key in repo_data}
+    rest = {key: value for key, value in repo_data.items() if key not in README_KEYS}
+    return json_codec.dumps(rest), zlib.compress(json_codec.dumps_bytes(readme), 1)
+
+def unpack_readme(readme_blob) -> Dict[str, Any]:
+    """Decompress the README fields stored by pack_repo_data"""
+    if not readme_blob:
+        return {}
+    try:
+        return json_codec.loads(zlib.decompress(readme_blob))
+    except (zlib.error, ValueError):
+        return {}
+
+def encode_metadata(metadata: Dict[str, Any]):
+    """
+    Encode custom metadata for the metadata column
+    
+    Uses MessagePack (smaller and faster to decode than JSON) when msgpack
+    is installed, marked with METADATA_MSGPACK_PREFIX; JSON text otherwise.
+    """
+    if msgpack is not None:
+        return METADATA_MSGPACK_PREFIX + msgpack.packb(metadata, use_bin_type=True, default=str)
+    return json_codec.dumps(metadata)
+
+def decode_metadata(value) -> Dict[str, Any]:
+    """
+    SQLite converter turning the stored metadata into a dictionary
+    
+    Accepts both the MessagePack encoding and JSON text, so rows written
+    before the switch (or without msgpack installed) still decode.
+    """
+    try:
+        if isinstance(value, bytes) and value[:1] == METADATA_MSGPACK_PREFIX:
+            if msgpack is None:
+                print("Cannot decode MessagePack metadata: msgpack is not installed")
+                return {}
+            return msgpack.unpackb(value[1:], raw=False) or {}
+        return json_codec.loads(value) or {}
+    except (ValueError, TypeError):
+        # Corrupt or non-text values decode to no metadata
+        return {}
+
+# Columns selected as "metadata [json]" are decoded by decode_metadata
+sqlite3.register_converter("json", decode_metadata)
+
+# Repository columns for list queries (the compressed README is only
+# needed by the detail view, so it is not read here). last_synced is a Unix
+# timestamp, cast because databases created by older versions declare it
+# TEXT; queries order by repositories.last_synced so its index is used.
+REPO_LIST_COLUMNS = (
+    'id, repo_url, name, owner, description, stars, forks, language, '
+    'last_updated, CAST(last_synced AS INTEGER) AS last_synced, '
+    'metadata AS "metadata [json]", cached_json'
+)
+
+# Same columns with metadata left as JSON text, in Repo field order
+REPO_ROW_COLUMNS = (
+    'id, repo_url, name, owner, description, stars, forks, language, '
+    'last_updated, CAST(last_synced AS INTEGER) AS last_synced, '
+    'metadata, cached_json'
+)
+
+class Repo(namedtuple("RepoRow", "id repo_url name owner description stars forks language "
+                                 "last_updated last_synced metadata_json cached_json")):
+    """
+    Read-only repository record returned by list queries
+    
+    Built straight from the row tuple, which is cheaper than a dict per row.
+    Supports the dict-style access used by callers (repo["name"],
+    repo.get("metadata")); the metadata JSON is only decoded the first time
+    it is read.
+    """
+    
+    @functools.cached_property
+    def metadata(self) -> Dict[str, Any]:
+        return decode_metadata(self.metadata_json) if self.metadata_json else {}
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return super().__getitem__(key)
+    
+    def get(self, key: str, default=None):
+        """Return the named field, or default if there is no such field"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def keys(self):
+        """Field names, with metadata in place of the raw JSON"""
+        return [("metadata" if field == "metadata_json" else field) for field in self._fields]
+
+# Statements used by the operations below; keeping the text identical on
+# every call lets the connection's statement cache reuse the compiled form
+SQL_INSERT_REPO = '''
+INSERT INTO repositories 
+(repo_url, name, owner, description, stars, forks, language, last_updated, last_synced, metadata, cached_json, readme_blob)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(repo_url) DO NOTHING
+'''
+
+SQL_UPDATE_REPO = '''
+UPDATE repositories SET
+name = ?,
+owner = ?,
+description = ?,
+stars = ?,
+forks = ?,
+language = ?,
+last_updated = ?,
+last_synced = ?,
+metadata = ?,
+cached_json = ?,
+readme_blob = ?
+WHERE repo_url = ?
+'''
+
+SQL_LIST_REPOS = f"SELECT {REPO_ROW_COLUMNS} FROM repositories ORDER BY repositories.last_synced DESC"
+SQL_GET_REPO = f"SELECT {REPO_LIST_COLUMNS}, readme_blob FROM repositories WHERE repo_url = ?"
+SQL_GET_REPO_LANGUAGE = "SELECT language FROM repositories WHERE repo_url = ?"
+SQL_DELETE_REPO = "DELETE FROM repositories WHERE repo_url = ?"
+
+SQL_ADD_TECH_COUNT = (
+    "INSERT INTO technologies (name, count) VALUES (?, ?) "
+    "ON CONFLICT(name) DO UPDATE SET count = count + excluded.count"
+)
+SQL_SUBTRACT_TECH_COUNT = "UPDATE technologies SET count = count - ? WHERE name = ?"
+SQL_DELETE_EMPTY_TECH = "DELETE FROM technologies WHERE name = ? AND count <= 0"
+SQL_TECH_STATS = "SELECT name, count FROM technologies ORDER BY count DESC"
+SQL_LANGUAGE_COUNTS = (
+    "SELECT language, COUNT(*) FROM repositories WHERE language != '' GROUP BY language"
+)
+SQL_REPO_METADATA = "SELECT metadata FROM repositories WHERE metadata IS NOT NULL"
+SQL_CLEAR_TECHS = "DELETE FROM technologies"
+SQL_INSERT_TECH = "INSERT INTO technologies (name, count) VALUES (?, ?)"
+
+# Per-connection settings, applied in one script when a connection is opened
+# (journal_mode is stored in the database file, so init_db sets it once):
+# - foreign key enforcement
+# - synchronous NORMAL: under WAL it only syncs at checkpoints and is still
+#   corruption-safe
+# - a larger page cache (20 MB) for the reused connection
+# - temporary tables and sort spills in memory; up to 256 MB of the file mapped
+# - the WAL truncated back to 64 MB after checkpoints, which run every
+#   1000 pages
+CONNECTION_PRAGMAS = """
+PRAGMA foreign_keys = ON;
+PRAGMA synchronous = NORMAL;
+PRAGMA cache_size = -20000;
+PRAGMA temp_store = MEMORY;
+PRAGMA mmap_size = 268435456;
+PRAGMA journal_size_limit = 67108864;
+PRAGMA wal_autocheckpoint = 1000;
+"""
+
+# Statement cache size per connection (sqlite3 default is 128)
+CACHED_STATEMENTS = 256
+
 def get_db_connection():
     """
-    Create a connection to the SQLite database with improved handling
-    for concurrent access
+    Get this thread's connection to the SQLite database with improved
+    handling for concurrent access
+    
+    Each thread opens one connection on first use and reuses it for every
+    later call, so the connect and PRAGMA setup run once per connection
+    rather than once per query. Release it with safe_close() instead of
+    closing it; a connection closed by a caller is replaced on the next call.
     """
+    thread = threading.current_thread()
+    conn = _connections.get(thread)
+    if conn is not None:
+        try:
+            # Discard anything a failed operation left uncommitted
+            if conn.in_transaction:
+                conn.rollback()
+            return conn
+        except sqlite3.ProgrammingError:
+            pass  # Closed by a caller; open a new one below
+            
     try:
-        # Add timeout and enable automatic retrying of locked database
-        conn = sqlite3.connect(DB_PATH, timeout=DB_TIMEOUT)
+        # Add timeout and enable automatic retrying of locked database;
+        # check_same_thread is off so dead threads' connections can be closed
+        conn = sqlite3.connect(DB_PATH, timeout=DB_TIMEOUT, check_same_thread=False,
+                               detect_types=sqlite3.PARSE_COLNAMES,
+                               cached_statements=CACHED_STATEMENTS)
         conn.row_factory = sqlite3.Row
-        # Enable foreign keys
-        conn.execute("PRAGMA foreign_keys = ON")
-        # Set journal mode to WAL for better concurrency
-        conn.execute("PRAGMA journal_mode = WAL")
-        return conn
+        conn.executescript(CONNECTION_PRAGMAS)
     except sqlite3.Error as e:
         print(f"Database connection error: {e}")
         # Return None so callers can handle the case of a failed connection
         return None
+        
+    with _connections_lock:
+        # Close connections left behind by threads that have finished
+        # (Streamlit runs each script run on a new thread)
+        for dead in [t for t in _connections if not t.is_alive()]:
+            _close_connection(_connections.pop(dead))
+        _connections[thread] = conn
+    return conn
+
+def _close_connection(conn):
+    """Close a pooled connection, reporting (not raising) errors"""
+    try:
+        conn.close()
+    except Exception as e:
+        print(f"Error closing database connection: {e}")
 
 def safe_close(conn):
-    """Safely close a database connection if it's open"""
+    """
+    Release a connection obtained from get_db_connection
+    
+    The connection stays open for reuse by the same thread; any uncommitted
+    changes are rolled back.
+    """
     if conn is not None:
         try:
-            conn.close()
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.ProgrammingError:
+            pass  # Already closed
         except Exception as e:
-            print(f"Error closing database connection: {e}")
+            print(f"Error releasing database connection: {e}")
+
+def close_all_connections():
+    """Close every pooled connection (registered to run at interpreter exit)"""
+    with _connections_lock:
+        connections = list(_connections.values())
+        _connections.clear()
+    for conn in connections:
+        _close_connection(conn)
+
+atexit.register(close_all_connections)
 
 def init_db():
     """Initialize the database with required tables"""
-    conn = None
-    try:
-        conn = get_db_connection()
-        if conn is None:
-            print("Cannot initialize database: Unable to connect")
-            return
-            
-        cursor = conn.cursor()
+    conn = get_db_connection()
+    if conn is None:
+        print("Cannot initialize database: Unable to connect")
+        return
         
-        # Create repositories table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS repositories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            repo_url TEXT UNIQUE NOT NULL,
-            name TEXT NOT NULL,
-            owner TEXT NOT NULL,
-            description TEXT,
-            stars INTEGER DEFAULT 0,
-            forks INTEGER DEFAULT 0,
-            language TEXT,
-            last_updated TEXT,
-            last_synced TEXT,
-            metadata TEXT
-        )
-        ''')
+    try:
+        # Track free pages so db_maintenance can vacuum incrementally; this
+        # only takes effect on a new (empty) database file
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
         
-        # Create technologies table for tech stack tracking
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS technologies (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL,
-            count INTEGER DEFAULT 0
-        )
-        ''')
+        # Set journal mode to WAL for better concurrency; the setting is
+        # persistent, so later connections open in WAL mode automatically
+        conn.execute("PRAGMA journal_mode = WAL")
         
-        conn.commit()
+        with conn:
+            # Create repositories table
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS repositories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                repo_url TEXT UNIQUE NOT NULL,
+                name TEXT NOT NULL,
+                owner TEXT NOT NULL,
+                description TEXT,
+                stars INTEGER DEFAULT 0,
+                forks INTEGER DEFAULT 0,
+                language TEXT,
+                last_updated TEXT,
+                last_synced INTEGER,
+                metadata TEXT,
+                cached_json TEXT,
+                readme_blob BLOB
+            )
+            ''')
+            
+            # Add columns introduced after the original schema to existing databases
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(repositories)")}
+            for column, column_type in (("cached_json", "TEXT"), ("readme_blob", "BLOB")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE repositories ADD COLUMN {column} {column_type}")
+            
+            # Convert last_synced values written by older versions (local time
+            # "YYYY-MM-DD HH:MM:SS") to Unix timestamps
+            conn.execute('''
+            UPDATE repositories
+            SET last_synced = CAST(strftime('%s', last_synced, 'utc') AS INTEGER)
+            WHERE last_synced LIKE '____-__-__ __:__:__'
+            ''')
+            
+            # Create technologies table for tech stack tracking
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS technologies (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                count INTEGER DEFAULT 0
+            )
+            ''')
+            
+            # Serve the repository list (ORDER BY last_synced DESC) from an index
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_repo_synced ON repositories(last_synced DESC)")
     except Exception as e:
         print(f"Error initializing database: {e}")
-    finally:
-        safe_close(conn)
+
+def invalidate_cache(repo_url: Optional[str] = None):
+    """
+    Drop cached repository reads
+    
+    Writes through this module invalidate automatically; call this after
+    changing the database by other means. With no argument everything is dropped.
+    """
+    _read_cache.invalidate(repo_url)
+
+def _repo_values(repo_data: Dict[str, Any]) -> Tuple:
+    """Column values from name through readme_blob, as used by SQL_INSERT_REPO and SQL_UPDATE_REPO"""
+    cached_json, readme_blob = pack_repo_data(repo_data)
+    return (
+        repo_data["name"],
+        repo_data["owner"]["login"],
+        repo_data.get("description", ""),
+        repo_data["stars"],
+        repo_data["forks"],
+        repo_data.get("language", ""),
+        repo_data["updated_at"],
+        int(time.time()),
+        encode_metadata(repo_data.get("custom_metadata", {})),
+        cached_json,
+        readme_blob
+    )
 
 def add_repository(repo_url: str, repo_data: Dict[str, Any]) -> bool:
     """
@@ -92,73 +387,29 @@ def add_repository(repo_url: str, repo_data: Dict[str, Any]) -> bool:
     Returns:
         bool: True if repository was added successfully, False otherwise
     """
-    max_retries = 5
-    retry_delay = 1.0  # seconds
-    
-    for attempt in range(max_retries):
-        try:
-            conn = get_db_connection()
-            if conn is None:
-                print(f"Cannot add repository {repo_url}: Unable to connect to database")
-                return False
-                
-            cursor = conn.cursor()
-            
-            # Check if repository already exists
-            cursor.execute("SELECT id FROM repositories WHERE repo_url = ?", (repo_url,))
-            if cursor.fetchone():
-                conn.close()
-                return False  # Repository already exists
-            
-            # Convert repo_data to JSON string for storage
-            metadata = json.dumps(repo_data.get("custom_metadata", {}))
-            
-            # Insert repository
-            cursor.execute('''
-            INSERT INTO repositories 
-            (repo_url, name, owner, description, stars, forks, language, last_updated, last_synced, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                repo_url,
-                repo_data["name"],
-                repo_data["owner"]["login"],
-                repo_data.get("description", ""),
-                repo_data["stars"],
-                repo_data["forks"],
-                repo_data.get("language", ""),
-                repo_data["updated_at"],
-                datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                metadata
-            ))
-            
-            conn.commit()
-            
-            # Update technology count - after committing main transaction
-            # to reduce lock duration
-            if repo_data.get("language"):
-                update_technology(repo_data["language"])
-            
-            # Update technologies from metadata if available
-            if repo_data.get("custom_metadata", {}).get("tech_stack"):
-                for tech in repo_data["custom_metadata"]["tech_stack"]:
-                    update_technology(tech)
-                    
-            conn.close()
-            return True
-            
-        except sqlite3.OperationalError as e:
-            if "database is locked" in str(e) and attempt < max_retries - 1:
-                print(f"Database locked, retrying in {retry_delay} seconds... (Attempt {attempt+1}/{max_retries})")
-                time.sleep(retry_delay)
-                retry_delay *= 1.5  # Exponential backoff
-                continue
-            print(f"Error adding repository: {e}")
-            return False
-        except Exception as e:
-            print(f"Error adding repository: {e}")
-            return False
+    conn = get_db_connection()
+    if conn is None:
+        print(f"Cannot add repository {repo_url}: Unable to connect to database")
+        return False
+        
+    try:
+        # Insert repository unless it already exists
+        with conn:
+            inserted = conn.execute(SQL_INSERT_REPO, (repo_url,) + _repo_values(repo_data)).rowcount == 1
+    except Exception as e:
+        print(f"Error adding repository: {e}")
+        return False
+        
+    if not inserted:
+        return False  # Repository already exists
+    _read_cache.invalidate(repo_url)
     
-    return False  # If we reached here, all retries failed
+    # Queue technology count updates (language and metadata tech stack)
+    # for the technology writer
+    techs = [repo_data["language"]] if repo_data.get("language") else []
+    techs.extend(repo_data.get("custom_metadata", {}).get("tech_stack") or [])
+    update_technologies(techs)
+    return True
 
 def update_repository(repo_url: str, repo_data: Dict[str, Any]) -> bool:
     """
@@ -171,245 +422,233 @@ def update_repository(repo_url: str, repo_data: Dict[str, Any]) -> bool:
     Returns:
         bool: True if repository was updated successfully, False otherwise
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check if repository exists
-        cursor.execute("SELECT id FROM repositories WHERE repo_url = ?", (repo_url,))
-        if not cursor.fetchone():
-            conn.close()
-            return False  # Repository doesn't exist
-        
-        # Convert repo_data to JSON string for storage
-        metadata = json.dumps(repo_data.get("custom_metadata", {}))
-        
-        # Update repository
-        cursor.execute('''
-        UPDATE repositories SET
-        name = ?,
-        owner = ?,
-        description = ?,
-        stars = ?,
-        forks = ?,
-        language = ?,
-        last_updated = ?,
-        last_synced = ?,
-        metadata = ?
-        WHERE repo_url = ?
-        ''', (
-            repo_data["name"],
-            repo_data["owner"]["login"],
-            repo_data.get("description", ""),
-            repo_data["stars"],
-            repo_data["forks"],
-            repo_data.get("language", ""),
-            repo_data["updated_at"],
-            datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            metadata,
-            repo_url
-        ))
-        
-        conn.commit()
-        conn.close()
-        return True
+    conn = get_db_connection()
+    if conn is None:
+        print(f"Cannot update repository {repo_url}: Unable to connect to database")
+        return False
         
+    try:
+        with conn:
+            updated = conn.execute(SQL_UPDATE_REPO, _repo_values(repo_data) + (repo_url,)).rowcount == 1
     except Exception as e:
         print(f"Error updating repository: {e}")
         return False
+        
+    if updated:
+        _read_cache.invalidate(repo_url)
+    return updated  # False if the repository doesn't exist
 
-def get_all_repositories() -> List[Dict[str, Any]]:
-    """Get all repositories from the database"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM repositories ORDER BY last_synced DESC")
+def iter_repositories() -> Iterator[Repo]:
+    """
+    Yield repositories, most recently synced first
+    
+    Rows are read from the cursor as the caller consumes them rather than
+    loaded all at once.
+    """
+    conn = get_db_connection()
+    if conn is None:
+        print("Cannot list repositories: Unable to connect to database")
+        return
         
-        repositories = []
-        for row in cursor.fetchall():
-            repo = dict(row)
-            # Convert metadata JSON string back to dictionary
-            try:
-                repo["metadata"] = json.loads(repo["metadata"]) if repo["metadata"] else {}
-            except:
-                repo["metadata"] = {}
-            repositories.append(repo)
-            
-        conn.close()
-        return repositories
+    cursor = conn.execute(SQL_LIST_REPOS)
+    
+    # Plain tuples are enough to build Repo records; metadata is decoded lazily
+    cursor.row_factory = None
+    for row in cursor:
+        yield Repo._make(row)
+
+def get_all_repositories() -> List[Repo]:
+    """Get all repositories from the database (served from the read cache when fresh)"""
+    hit, repositories = _read_cache.get(ALL_REPOSITORIES)
+    if hit:
+        return list(repositories)
+        
+    try:
+        repositories = list(iter_repositories())
+        _read_cache.set(ALL_REPOSITORIES, repositories)
+        return list(repositories)
     except Exception as e:
         print(f"Error getting repositories: {e}")
         return []
 
 def get_repository(repo_url: str) -> Optional[Dict[str, Any]]:
-    """Get a specific repository by URL"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM repositories WHERE repo_url = ?", (repo_url,))
-        
-        row = cursor.fetchone()
-        if not row:
-            conn.close()
-            return None
-            
-        repo = dict(row)
-        # Convert metadata JSON string back to dictionary
-        try:
-            repo["metadata"] = json.loads(repo["metadata"]) if repo["metadata"] else {}
-        except:
-            repo["metadata"] = {}
-            
-        conn.close()
+    """Get a specific repository by URL (served from the read cache when fresh)"""
+    hit, repo = _read_cache.get(repo_url)
+    if hit:
         return repo
+        
+    conn = get_db_connection()
+    if conn is None:
+        print(f"Cannot get repository {repo_url}: Unable to connect to database")
+        return None
+        
+    try:
+        row = conn.execute(SQL_GET_REPO, (repo_url,)).fetchone()
     except Exception as e:
         print(f"Error getting repository: {e}")
         return None
+        
+    repo = None
+    if row:
+        repo = dict(row)
+        # Metadata is decoded by the json converter; NULL becomes {}
+        if repo["metadata"] is None:
+            repo["metadata"] = {}
+        # Decompress the stored README
+        repo.update(unpack_readme(repo.pop("readme_blob", None)))
+        
+    _read_cache.set(repo_url, repo)
+    return repo
 
 def delete_repository(repo_url: str) -> bool:
     """Delete a repository from the database"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check if repository exists
-        cursor.execute("SELECT language FROM repositories WHERE repo_url = ?", (repo_url,))
-        repo = cursor.fetchone()
-        if not repo:
-            conn.close()
-            return False
-            
-        # Update technology count if needed
-        if repo["language"]:
-            decrease_technology_count(repo["language"])
+    conn = get_db_connection()
+    if conn is None:
+        print(f"Cannot delete repository {repo_url}: Unable to connect to database")
+        return False
         
-        # Delete repository
-        cursor.execute("DELETE FROM repositories WHERE repo_url = ?", (repo_url,))
-        conn.commit()
-        conn.close()
-        return True
+    try:
+        with conn:
+            # Check if repository exists
+            repo = conn.execute(SQL_GET_REPO_LANGUAGE, (repo_url,)).fetchone()
+            if repo:
+                conn.execute(SQL_DELETE_REPO, (repo_url,))
     except Exception as e:
         print(f"Error deleting repository: {e}")
         return False
+        
+    if not repo:
+        return False
+    _read_cache.invalidate(repo_url)
+    
+    # Update technology count if needed
+    if repo["language"]:
+        decrease_technology_count(repo["language"])
+    return True
 
-def update_technology(name: str):
-    """
-    Increment the count for a technology with retry mechanism
-    to handle database locks
+def _apply_technology_deltas(deltas: List[Tuple[str, int]]):
     """
-    max_retries = 5
-    retry_delay = 1.0  # seconds
+    Apply queued (name, +1/-1) technology count changes in one transaction
     
-    for attempt in range(max_retries):
-        try:
-            conn = get_db_connection()
-            if conn is None:
-                print(f"Cannot update technology {name}: Unable to connect to database")
-                return
-                
-            cursor = conn.cursor()
-            
-            # Check if technology exists
-            cursor.execute("SELECT count FROM technologies WHERE name = ?", (name,))
-            tech = cursor.fetchone()
-            
-            if tech:
-                # Update count
-                cursor.execute("UPDATE technologies SET count = count + 1 WHERE name = ?", (name,))
-            else:
-                # Insert new technology
-                cursor.execute("INSERT INTO technologies (name, count) VALUES (?, 1)", (name,))
-                
-            conn.commit()
-            conn.close()
-            return  # Success!
-        except sqlite3.OperationalError as e:
-            if "database is locked" in str(e):
-                # If this is not our last attempt, wait and retry
-                if attempt < max_retries - 1:
-                    print(f"Database locked, retrying in {retry_delay} seconds... (Attempt {attempt+1}/{max_retries})")
-                    time.sleep(retry_delay)
-                    retry_delay *= 1.5  # Exponential backoff
-                    continue
-            print(f"Error updating technology: {e}")
-            return
-        except Exception as e:
-            print(f"Error updating technology: {e}")
-            return
-
-def decrease_technology_count(name: str):
+    Changes are summed per technology first, so each name is written once
+    with its net change however many times it was queued.
     """
-    Decrease the count for a technology with retry mechanism
-    to handle database locks
+    totals = Counter()
+    for name, delta in deltas:
+        totals[name] += delta
+    increases = [(name, total) for name, total in totals.items() if total > 0]
+    decreases = [(-total, name) for name, total in totals.items() if total < 0]
+    if not increases and not decreases:
+        return
+        
+    conn = get_db_connection()
+    if conn is None:
+        print(f"Cannot update {len(totals)} technology counts: Unable to connect to database")
+        return
+        
+    try:
+        with conn:
+            # Insert new technologies or add to the existing counts
+            conn.executemany(SQL_ADD_TECH_COUNT, increases)
+            # Lower counts and remove technologies that reached zero
+            conn.executemany(SQL_SUBTRACT_TECH_COUNT, decreases)
+            conn.executemany(SQL_DELETE_EMPTY_TECH, [(name,) for _, name in decreases])
+    except Exception as e:
+        print(f"Error updating technology counts: {e}")
+
+def _technology_writer():
     """
-    max_retries = 5
-    retry_delay = 1.0  # seconds
+    Background thread applying technology count changes
     
-    for attempt in range(max_retries):
+    Waits for a change, then gathers whatever else arrives within
+    TECH_BATCH_WAIT (up to TECH_BATCH_SIZE changes) and writes them in a
+    single transaction. Being the only writer of the technologies table
+    means callers never wait on each other's locks.
+    """
+    while True:
+        deltas = [_tech_queue.get()]
         try:
-            conn = get_db_connection()
-            if conn is None:
-                print(f"Cannot decrease count for {name}: Unable to connect to database")
-                return
-                
-            cursor = conn.cursor()
-            
-            # Update count and remove if zero
-            cursor.execute("UPDATE technologies SET count = count - 1 WHERE name = ?", (name,))
-            cursor.execute("DELETE FROM technologies WHERE count <= 0")
-                
-            conn.commit()
-            conn.close()
-            return  # Success!
-        except sqlite3.OperationalError as e:
-            if "database is locked" in str(e):
-                # If this is not our last attempt, wait and retry
-                if attempt < max_retries - 1:
-                    print(f"Database locked, retrying in {retry_delay} seconds... (Attempt {attempt+1}/{max_retries})")
-                    time.sleep(retry_delay)
-                    retry_delay *= 1.5  # Exponential backoff
-                    continue
-            print(f"Error decreasing technology count: {e}")
-            return
-        except Exception as e:
-            print(f"Error decreasing technology count: {e}")
-            return
+            while len(deltas) < TECH_BATCH_SIZE:
+                deltas.append(_tech_queue.get(timeout=TECH_BATCH_WAIT))
+        except queue.Empty:
+            pass
+        _apply_technology_deltas(deltas)
+        for _ in deltas:
+            _tech_queue.task_done()
 
-def get_technology_stats() -> List[Dict[str, Any]]:
+def flush_technology_updates():
+    """Block until every queued technology count change has been written"""
+    _tech_queue.join()
+
+def update_technology(name: str):
+    """Queue an increment of the count for a technology"""
+    _tech_queue.put((name, 1))
+
+def update_technologies(names: List[str]):
     """
-    Get statistics for all technologies with retry mechanism
-    to handle database locks
+    Queue increments of the counts for several technologies
+    
+    A name appearing more than once is incremented once per occurrence;
+    empty names are skipped.
+    """
+    for name in names:
+        if name:
+            _tech_queue.put((name, 1))
+
+def decrease_technology_count(name: str):
+    """Queue a decrement of the count for a technology (removed at zero)"""
+    _tech_queue.put((name, -1))
+
+def recompute_technology_counts() -> int:
     """
-    max_retries = 5
-    retry_delay = 1.0  # seconds
+    Rebuild the technologies table from the stored repositories
     
-    for attempt in range(max_retries):
-        try:
-            conn = get_db_connection()
-            if conn is None:
-                print("Cannot get technology stats: Unable to connect to database")
-                return []
-                
-            cursor = conn.cursor()
-            cursor.execute("SELECT name, count FROM technologies ORDER BY count DESC")
+    Languages are counted with one GROUP BY query and metadata tech stacks
+    are added from a single scan, then the table is replaced in one
+    transaction. Use after bulk imports or to repair drifted counts.
+    
+    Returns:
+        int: Number of technologies, or -1 on error
+    """
+    flush_technology_updates()
+    conn = get_db_connection()
+    if conn is None:
+        print("Cannot recompute technology counts: Unable to connect to database")
+        return -1
+        
+    try:
+        counts = Counter(dict(conn.execute(SQL_LANGUAGE_COUNTS).fetchall()))
+        for (metadata,) in conn.execute(SQL_REPO_METADATA):
+            counts.update(name for name in decode_metadata(metadata).get("tech_stack") or [] if name)
             
-            stats = [dict(row) for row in cursor.fetchall()]
-            conn.close()
-            return stats
-        except sqlite3.OperationalError as e:
-            if "database is locked" in str(e):
-                # If this is not our last attempt, wait and retry
-                if attempt < max_retries - 1:
-                    print(f"Database locked, retrying in {retry_delay} seconds... (Attempt {attempt+1}/{max_retries})")
-                    time.sleep(retry_delay)
-                    retry_delay *= 1.5  # Exponential backoff
-                    continue
-            print(f"Error getting technology stats: {e}")
-            return []
-        except Exception as e:
-            print(f"Error getting technology stats: {e}")
-            return []
+        with conn:
+            conn.execute(SQL_CLEAR_TECHS)
+            conn.executemany(SQL_INSERT_TECH, counts.items())
+        return len(counts)
+    except Exception as e:
+        print(f"Error recomputing technology counts: {e}")
+        return -1
+
+def get_technology_stats() -> List[Dict[str, Any]]:
+    """Get statistics for all technologies, including any queued changes"""
+    flush_technology_updates()
+    conn = get_db_connection()
+    if conn is None:
+        print("Cannot get technology stats: Unable to connect to database")
+        return []
+    try:
+        return [dict(row) for row in conn.execute(SQL_TECH_STATS).fetchall()]
+    except Exception as e:
+        print(f"Error getting technology stats: {e}")
+        return []
+
+# Single writer for technology counts
+threading.Thread(target=_technology_writer, name="technology-writer", daemon=True).start()
+
+# Write queued changes before the pooled connections are closed at exit
+# (atexit runs handlers in reverse registration order)
+atexit.register(flush_technology_updates)
 
-# Initialize database if it doesn't exist
-if not os.path.exists(DB_PATH):
-    init_db()
+# Initialize database (creates missing tables and adds columns missing
+# from databases created by older versions)
+init_db()
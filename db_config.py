@@ -3,9 +3,11 @@ Database configuration manager for RepoSpotlight
 Automatically selects the appropriate database backend based on the environment
 """
 import os
-import streamlit as st
+import functools
+from app_secrets import streamlit_secret
 
 # Check if we're running on Streamlit Cloud
+@functools.lru_cache(maxsize=1)
 def is_cloud_environment():
     """
     Check if the app is running on Streamlit Cloud
@@ -13,6 +15,9 @@ def is_cloud_environment():
     This checks for common environment variables that would be present in a cloud environment
     or a specific flag set in secrets.toml
     
+    The environment does not change while the process runs, so the result
+    is computed once and cached.
+    
     Returns:
         bool: True if running on cloud, False if running locally
     """
@@ -21,8 +26,9 @@ def is_cloud_environment():
         return True
         
     # Check for a user-defined flag in secrets
-    if hasattr(st, "secrets") and "USE_CLOUD_DB" in st.secrets:
-        return st.secrets["USE_CLOUD_DB"] == True
+    use_cloud_db = streamlit_secret("USE_CLOUD_DB")
+    if use_cloud_db is not None:
+        return use_cloud_db == True
     
     # Check for environment variable
     if os.environ.get("USE_CLOUD_DB") == "true":
@@ -42,3 +48,11 @@ if is_cloud_environment():
 else:
     import database as db
     print("Using local SQLite database backend")
+
+# Bind the backend's operations once so callers get plain function objects
+add_repository = db.add_repository
+update_repository = db.update_repository
+get_repository = db.get_repository
+get_all_repositories = db.get_all_repositories
+delete_repository = db.delete_repository
+get_technology_stats = db.get_technology_stats
@@ -4,101 +4,255 @@ Database maintenance utility for GitHub Project Showcase
 import os
 import sqlite3
 import shutil
+from contextlib import contextmanager
 
 DB_PATH = "github_projects.db"
 WAL_PATH = "github_projects.db-wal"
 SHM_PATH = "github_projects.db-shm"
 BACKUP_DIR = ".db_backups"
 
+# How long maintenance statements wait for a lock held by the app (in milliseconds)
+BUSY_TIMEOUT_MS = 5000
+
+# Memory map size and page cache size (64 MB) for maintenance connections
+MMAP_SIZE = 268435456
+CACHE_SIZE_KB = 65536
+
+# Size the WAL is truncated back to after a checkpoint (64 MB), and the
+# number of WAL pages that triggers an automatic checkpoint
+JOURNAL_SIZE_LIMIT = 67108864
+WAL_AUTOCHECKPOINT_PAGES = 1000
+
+def _tune(conn):
+    """
+    Configure a connection for whole-file operations such as VACUUM
+    
+    Memory-mapped I/O lets full-file scans read pages without a read()
+    syscall per page; a large page cache, NORMAL sync and in-memory temp
+    storage cut the remaining I/O.
+    """
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    try:
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    except sqlite3.Error as e:
+        # Builds without mmap support keep using regular reads
+        print(f"Memory-mapped I/O not available: {e}")
+
+def get_connection():
+    """
+    Open a tuned maintenance connection
+    
+    The connection runs in autocommit mode (isolation_level=None) so PRAGMAs
+    and VACUUM execute outside implicit transactions, and waits up to
+    BUSY_TIMEOUT_MS for locks instead of failing immediately.
+    """
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    _tune(conn)
+    return conn
+
+@contextmanager
+def _use_connection(conn=None):
+    """Yield conn if given, otherwise a new connection closed afterwards"""
+    if conn is not None:
+        yield conn
+        return
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+def _pragma(statements, start, done, error, conn=None):
+    """
+    Run maintenance statements, reporting progress (using conn if given)
+    
+    Connections are in autocommit mode, so each statement takes effect as
+    soon as it runs. Only database errors are caught.
+    
+    Returns:
+        bool: True if every statement succeeded, False otherwise
+    """
+    try:
+        print(start)
+        with _use_connection(conn) as conn:
+            for sql in statements:
+                conn.execute(sql).fetchall()
+        print(done)
+        return True
+    except sqlite3.Error as e:
+        print(f"{error}: {e}")
+        return False
+
+# Chunk size for file copies (1 MiB)
+COPY_CHUNK_SIZE = 1 << 20
+
+def _fastcopy(src, dst):
+    """
+    Copy a file, keeping the data in the kernel where possible
+    
+    Tries copy_file_range (which can reflink on btrfs/xfs), then sendfile,
+    then a buffered copy with COPY_CHUNK_SIZE chunks; file metadata is
+    preserved like shutil.copy2.
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            while os.copy_file_range(fsrc.fileno(), fdst.fileno(), COPY_CHUNK_SIZE * 64):
+                pass
+        except (AttributeError, OSError):
+            try:
+                offset = fsrc.tell()
+                while True:
+                    sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, COPY_CHUNK_SIZE)
+                    if not sent:
+                        break
+                    offset += sent
+            except (AttributeError, OSError):
+                # Restart from scratch in case a partial copy happened
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+                shutil.copyfileobj(fsrc, fdst, length=COPY_CHUNK_SIZE)
+    shutil.copystat(src, dst)
+
+# Pages copied per step of an online backup, and the pause between steps
+BACKUP_PAGES = 1000
+BACKUP_SLEEP = 0.001
+
+def _copy_database_files(timestamp):
+    """Copy the database, WAL and SHM files that exist as-is"""
+    # One directory scan finds all three files instead of a stat() per file
+    labels = {DB_PATH: "Database", WAL_PATH: "WAL file", SHM_PATH: "SHM file"}
+    names = {os.path.basename(path): path for path in labels}
+    with os.scandir(os.path.dirname(DB_PATH) or ".") as entries:
+        present = {names[entry.name] for entry in entries if entry.name in names}
+    
+    for path, label in labels.items():
+        if path in present:
+            backup_path = os.path.join(BACKUP_DIR, f"{timestamp}_{os.path.basename(path)}")
+            _fastcopy(path, backup_path)
+            print(f"{label} backed up to {backup_path}")
+
 def backup_database():
-    """Backup the database files"""
+    """
+    Backup the database
+    
+    Uses the SQLite Online Backup API, which copies a consistent snapshot
+    (including committed WAL contents) into a single file even while the app
+    is writing. If the database cannot be read, the raw database, WAL and
+    SHM files are copied instead; if there is no database, nothing is done.
+    """
+    try:
+        # mode=rw fails on a missing database instead of creating an empty one
+        src = sqlite3.connect(f"file:{DB_PATH}?mode=rw", uri=True, timeout=BUSY_TIMEOUT_MS / 1000)
+    except sqlite3.Error:
+        return
+    
     # Create backup directory if it doesn't exist
-    if not os.path.exists(BACKUP_DIR):
-        os.makedirs(BACKUP_DIR)
+    os.makedirs(BACKUP_DIR, exist_ok=True)
         
     # Get timestamp
     import datetime
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_path = os.path.join(BACKUP_DIR, f"{timestamp}_{DB_PATH}")
     
-    # Backup main database file
-    if os.path.exists(DB_PATH):
-        backup_path = os.path.join(BACKUP_DIR, f"{timestamp}_{DB_PATH}")
-        shutil.copy2(DB_PATH, backup_path)
+    try:
+        dst = sqlite3.connect(backup_path)
+        try:
+            src.backup(dst, pages=BACKUP_PAGES, sleep=BACKUP_SLEEP)
+        finally:
+            dst.close()
         print(f"Database backed up to {backup_path}")
-    
-    # Backup WAL file if it exists
-    if os.path.exists(WAL_PATH):
-        backup_path = os.path.join(BACKUP_DIR, f"{timestamp}_{os.path.basename(WAL_PATH)}")
-        shutil.copy2(WAL_PATH, backup_path)
-        print(f"WAL file backed up to {backup_path}")
-    
-    # Backup SHM file if it exists
-    if os.path.exists(SHM_PATH):
-        backup_path = os.path.join(BACKUP_DIR, f"{timestamp}_{os.path.basename(SHM_PATH)}")
-        shutil.copy2(SHM_PATH, backup_path)
-        print(f"SHM file backed up to {backup_path}")
+    except sqlite3.Error as e:
+        print(f"Online backup failed ({e}), copying database files instead")
+        _copy_database_files(timestamp)
+    finally:
+        src.close()
+
+# Free pages required before vacuuming: at least VACUUM_MIN_FREE_PAGES
+# and at least VACUUM_MIN_FREE_RATIO of the file
+VACUUM_MIN_FREE_PAGES = 1000
+VACUUM_MIN_FREE_RATIO = 0.10
 
-def vacuum_database():
-    """Vacuum the database to optimize it"""
+# Pages released per incremental vacuum step, and steps between checkpoints
+INCREMENTAL_VACUUM_PAGES = 1000
+CHECKPOINT_EVERY_STEPS = 4
+
+def vacuum_database(conn=None):
+    """
+    Vacuum the database to optimize it (using conn if given)
+    
+    Skipped when few pages are free. Databases in incremental auto_vacuum
+    mode release free pages in steps with a passive WAL checkpoint every few
+    steps, so the WAL stays small; other databases get one full VACUUM,
+    which also switches them to incremental mode.
+    """
     try:
-        print("Vacuuming database...")
-        conn = sqlite3.connect(DB_PATH)
-        conn.execute("VACUUM")
-        conn.close()
+        with _use_connection(conn) as conn:
+            free, = conn.execute("PRAGMA freelist_count").fetchone()
+            total, = conn.execute("PRAGMA page_count").fetchone()
+            if free < max(VACUUM_MIN_FREE_PAGES, total * VACUUM_MIN_FREE_RATIO):
+                print(f"Skipping vacuum: {free} of {total} pages free")
+                return True
+            
+            auto_vacuum, = conn.execute("PRAGMA auto_vacuum").fetchone()
+            if auto_vacuum == 2:
+                print(f"Incrementally vacuuming database ({free} free pages)...")
+                steps = 0
+                while conn.execute("PRAGMA freelist_count").fetchone()[0]:
+                    # executescript steps the PRAGMA to completion; execute()
+                    # would only release a single page
+                    conn.executescript(f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES})")
+                    steps += 1
+                    if steps % CHECKPOINT_EVERY_STEPS == 0:
+                        conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            else:
+                print("Vacuuming database...")
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
         print("Database vacuum completed successfully")
         return True
-    except Exception as e:
+    except sqlite3.Error as e:
         print(f"Error vacuuming database: {e}")
         return False
 
-def checkpoint_wal():
-    """Force a checkpoint of the WAL file"""
-    try:
-        print("Forcing WAL checkpoint...")
-        conn = sqlite3.connect(DB_PATH)
-        conn.execute("PRAGMA wal_checkpoint(FULL)")
-        conn.close()
-        print("WAL checkpoint completed")
-        return True
-    except Exception as e:
-        print(f"Error checkpointing WAL: {e}")
-        return False
+def checkpoint_wal(conn=None):
+    """Force a checkpoint of the WAL file (using conn if given)"""
+    return _pragma(["PRAGMA wal_checkpoint(FULL)"], "Forcing WAL checkpoint...",
+                   "WAL checkpoint completed", "Error checkpointing WAL", conn)
 
-def reset_journal_mode():
-    """Reset journal mode to DELETE (from WAL)"""
-    try:
-        print("Resetting journal mode to DELETE...")
-        conn = sqlite3.connect(DB_PATH)
-        conn.execute("PRAGMA journal_mode = DELETE")
-        conn.close()
-        print("Journal mode reset")
-        return True
-    except Exception as e:
-        print(f"Error resetting journal mode: {e}")
-        return False
+def reset_journal_mode(conn=None):
+    """Reset journal mode to DELETE (from WAL) (using conn if given)"""
+    return _pragma(["PRAGMA journal_mode = DELETE"], "Resetting journal mode to DELETE...",
+                   "Journal mode reset", "Error resetting journal mode", conn)
 
-def set_wal_mode():
-    """Set journal mode to WAL"""
-    try:
-        print("Setting journal mode to WAL...")
-        conn = sqlite3.connect(DB_PATH)
-        conn.execute("PRAGMA journal_mode = WAL")
-        conn.close()
-        print("Journal mode set to WAL")
-        return True
-    except Exception as e:
-        print(f"Error setting WAL mode: {e}")
-        return False
+def set_wal_mode(conn=None):
+    """
+    Set journal mode to WAL (using conn if given)
+    
+    Only journal_mode is stored in the database file; the WAL size limit,
+    autocheckpoint interval, NORMAL sync and busy timeout are applied to this
+    connection (database.py sets the same values on the app's connections).
+    """
+    return _pragma([
+        "PRAGMA journal_mode = WAL",
+        f"PRAGMA journal_size_limit = {JOURNAL_SIZE_LIMIT}",
+        f"PRAGMA wal_autocheckpoint = {WAL_AUTOCHECKPOINT_PAGES}",
+        "PRAGMA synchronous = NORMAL",
+        f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    ], "Setting journal mode to WAL...", "Journal mode set to WAL", "Error setting WAL mode", conn)
 
-def clean_wal_files():
-    """Clean up WAL and SHM files"""
+def clean_wal_files(conn=None):
+    """Clean up WAL and SHM files (using conn if given)"""
     try:
         print("Cleaning WAL files...")
         # First try to checkpoint
-        checkpoint_wal()
+        checkpoint_wal(conn)
         
         # Then reset journal mode
-        reset_journal_mode()
+        reset_journal_mode(conn)
         
         # Delete WAL file if it exists
         if os.path.exists(WAL_PATH):
@@ -111,10 +265,10 @@ def clean_wal_files():
             print(f"Removed {SHM_PATH}")
         
         # Reset to WAL mode
-        set_wal_mode()
+        set_wal_mode(conn)
         
         return True
-    except Exception as e:
+    except OSError as e:
         print(f"Error cleaning WAL files: {e}")
         return False
 
@@ -125,11 +279,21 @@ def fix_locked_database():
     # First backup the database
     backup_database()
     
-    # Try vacuum
-    vacuum_result = vacuum_database()
+    # Run the remaining steps on one connection
+    try:
+        conn = get_connection()
+    except sqlite3.Error as e:
+        print(f"Error opening database: {e}")
+        return False
     
-    # Clean WAL files
-    wal_result = clean_wal_files()
+    try:
+        # Try vacuum
+        vacuum_result = vacuum_database(conn)
+        
+        # Clean WAL files
+        wal_result = clean_wal_files(conn)
+    finally:
+        conn.close()
     
     if vacuum_result and wal_result:
         print("Database lock issues should be resolved")
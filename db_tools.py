@@ -16,6 +16,9 @@ def main():
     # Info command
     info_parser = subparsers.add_parser('info', help='Show database information')
     
+    # Recount command
+    recount_parser = subparsers.add_parser('recount', help='Rebuild technology counts from the stored repositories')
+    
     # Parse arguments
     args = parser.parse_args()
     
@@ -65,16 +68,23 @@ def main():
             firebase_configured = True
             print("- Firebase: Configured via environment variables")
         
-        import streamlit as st
-        if hasattr(st, "secrets"):
-            if "FIREBASE_CREDENTIALS" in st.secrets or "FIREBASE_CREDENTIALS_PATH" in st.secrets:
-                firebase_configured = True
-                print("- Firebase: Configured via Streamlit secrets")
+        from app_secrets import streamlit_secret
+        if streamlit_secret("FIREBASE_CREDENTIALS") or streamlit_secret("FIREBASE_CREDENTIALS_PATH"):
+            firebase_configured = True
+            print("- Firebase: Configured via Streamlit secrets")
         
         if not firebase_configured:
             print("- Firebase: Not configured")
             print("  Please set up Firebase credentials to use cloud storage.")
     
+    elif args.command == 'recount':
+        from db_config import db
+        count = db.recompute_technology_counts()
+        if count < 0:
+            print("Could not recompute technology counts.")
+            sys.exit(1)
+        print(f"Recomputed counts for {count} technologies.")
+    
     else:
         parser.print_help()
 
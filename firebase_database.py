@@ -2,36 +2,70 @@
 Cloud database module for RepoSpotlight using Firebase Firestore
 Used as a persistent data storage solution for Streamlit Cloud
 """
-import json
-from typing import List, Dict, Any, Optional
+import json_codec
+import functools
+from collections import Counter
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import datetime
 import os
-import streamlit as st
 import firebase_admin
 from firebase_admin import credentials, firestore
-import uuid
+from google.api_core import exceptions as google_exceptions
+import hashlib
+import threading
+import zlib
+from read_cache import ReadCache, ALL_REPOSITORIES
+from app_secrets import read_secret
 
-# Firebase initialization status
+# Firebase initialization status (guarded by _init_lock, since Streamlit
+# runs script reruns on several threads)
 _firebase_initialized = False
+_init_lock = threading.Lock()
+
+# Process-local cache for repository reads (entries expire after 60 seconds)
+_read_cache = ReadCache(ttl=60.0)
+
+# Repository fields read for list views (everything except readme_blob)
+REPO_LIST_FIELDS = [
+    "id", "repo_url", "name", "owner", "description", "stars", "forks", "language",
+    "last_updated", "last_synced", "metadata", "cached_json"
+]
+
+# repo_data keys stored compressed in readme_blob instead of cached_json
+README_KEYS = ("readme",)
+
+def pack_repo_data(repo_data: Dict[str, Any]):
+    """
+    Split repository data for storage
+    
+    Returns:
+        (cached_json, readme_blob): the JSON text without the README fields,
+        and the README fields as level-1 zlib-compressed JSON (keeps large
+        READMEs well under Firestore's 1 MiB document limit)
+    """
+    readme = {key: repo_data[key] for key in README_KEYS if key in repo_data}
+    rest = {key: value for key, value in repo_data.items() if key not in README_KEYS}
+    return json_codec.dumps(rest), zlib.compress(json_codec.dumps_bytes(readme), 1)
+
+def unpack_readme(readme_blob) -> Dict[str, Any]:
+    """Decompress the README fields stored by pack_repo_data"""
+    if not readme_blob:
+        return {}
+    try:
+        return json_codec.loads(zlib.decompress(readme_blob))
+    except (zlib.error, ValueError):
+        return {}
 
 # Get the Firebase credentials from environment or secrets
 def get_firebase_creds():
     """Retrieve Firebase credentials from environment or Streamlit secrets"""
-    # Check for JSON in environment variable
-    firebase_json = os.environ.get("FIREBASE_CREDENTIALS")
-    
-    # If not in environment, check Streamlit secrets
-    if not firebase_json and hasattr(st, "secrets") and "FIREBASE_CREDENTIALS" in st.secrets:
-        firebase_json = st.secrets["FIREBASE_CREDENTIALS"]
-    
+    # Check for JSON in environment variable or secrets
+    firebase_json = read_secret("FIREBASE_CREDENTIALS")
     if firebase_json:
         return firebase_json
     
     # If the credentials are stored as a file path
-    creds_path = os.environ.get("FIREBASE_CREDENTIALS_PATH")
-    if not creds_path and hasattr(st, "secrets") and "FIREBASE_CREDENTIALS_PATH" in st.secrets:
-        creds_path = st.secrets["FIREBASE_CREDENTIALS_PATH"]
-    
+    creds_path = read_secret("FIREBASE_CREDENTIALS_PATH")
     if creds_path and os.path.exists(creds_path):
         with open(creds_path, 'r') as f:
             return f.read()
@@ -46,24 +80,35 @@ def init_firebase():
     if _firebase_initialized:
         return True
     
+    with _init_lock:
+        # Another thread may have finished initializing while we waited
+        if _firebase_initialized:
+            return True
+        return _initialize_app()
+
+def _initialize_app():
+    """Create the default Firebase app (called with _init_lock held)"""
+    global _firebase_initialized
+    
     try:
         # Get Firebase credentials
         firebase_creds = get_firebase_creds()
         if not firebase_creds:
             raise ValueError("Firebase credentials not found. Please set FIREBASE_CREDENTIALS in environment or secrets.")
         
-        # Create temporary credentials file (Firebase requires a file path)
-        import tempfile
-        with tempfile.NamedTemporaryFile(delete=False, mode='w') as temp_file:
-            temp_file.write(firebase_creds)
-            temp_file_path = temp_file.name
-        
-        # Initialize Firebase with the credentials
-        cred = credentials.Certificate(temp_file_path)
-        firebase_admin.initialize_app(cred)
+        # Certificate accepts the parsed service account info directly, so
+        # the credentials never need to be written to disk; secrets may hold
+        # either a JSON string or a TOML table
+        if isinstance(firebase_creds, str):
+            service_account_info = json_codec.loads(firebase_creds)
+        else:
+            service_account_info = dict(firebase_creds)
         
-        # Clean up the temporary file
-        os.unlink(temp_file_path)
+        # Initialize Firebase with the credentials (unless the default app
+        # was already created elsewhere in this process)
+        cred = credentials.Certificate(service_account_info)
+        if not firebase_admin._apps:
+            firebase_admin.initialize_app(cred)
         
         _firebase_initialized = True
         return True
@@ -72,8 +117,14 @@ def init_firebase():
         return False
 
 # Get Firestore database client
+@functools.lru_cache(maxsize=1)
 def get_db():
-    """Get the Firestore database client"""
+    """
+    Get the Firestore database client
+    
+    The client is created once per process and reused by every operation;
+    init_db() at import time warms it.
+    """
     if not init_firebase():
         raise ValueError("Failed to initialize Firebase")
     return firestore.client()
@@ -99,6 +150,279 @@ def safe_close(conn):
     """Dummy function to maintain API compatibility with SQLite version"""
     pass
 
+def decode_metadata(value) -> Dict[str, Any]:
+    """
+    Return stored metadata as a dictionary
+    
+    Metadata is stored as a native map; documents written by older versions
+    (and metadata a map cannot hold, see is_map_compatible) hold a JSON
+    string instead, which is decoded here.
+    """
+    if isinstance(value, dict):
+        return value
+    try:
+        return json_codec.loads(value) if value else {}
+    except (TypeError, ValueError):
+        return {}
+
+def is_map_compatible(value, in_array: bool = False) -> bool:
+    """
+    Check that value can be stored in a native Firestore map
+    
+    Firestore rejects arrays nested directly in arrays, and map keys that
+    are empty, not strings, or reserved (__name__ style).
+    """
+    if isinstance(value, dict):
+        return all(
+            isinstance(key, str) and key and not (key.startswith("__") and key.endswith("__"))
+            and is_map_compatible(item)
+            for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return not in_array and all(is_map_compatible(item, True) for item in value)
+    return True
+
+class LazyRepo(dict):
+    """
+    Repository dictionary returned by list queries
+    
+    Metadata stored by older versions as a JSON string is only decoded the
+    first time it is read (repo["metadata"], repo.get("metadata") or
+    repo.metadata), so rows the caller never inspects are not parsed.
+    """
+    
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if key == "metadata" and not isinstance(value, dict):
+            value = decode_metadata(value)
+            self[key] = value
+        return value
+    
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self["metadata"]
+
+def sync_timestamp(value) -> int:
+    """
+    Return a stored last_synced value as a Unix timestamp
+    
+    last_synced is stored as a Firestore timestamp. Documents written by
+    older versions hold Unix seconds or a local-time "YYYY-MM-DD HH:MM:SS"
+    string instead, which are converted here (0 if it cannot be parsed).
+    """
+    if isinstance(value, datetime.datetime):
+        return int(value.timestamp())
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(datetime.datetime.strptime(value, "%Y-%m-%d %H:%M:%S").timestamp())
+    except (TypeError, ValueError):
+        return 0
+
+def repo_doc_id(repo_url: str) -> str:
+    """Document ID for a repository: the SHA1 hex digest of its URL"""
+    return hashlib.sha1(repo_url.encode("utf-8")).hexdigest()
+
+def find_repo_doc(db, repo_url: str, field_paths: Optional[List[str]] = None):
+    """
+    Look up the stored document for a repository
+    
+    Repositories are keyed by repo_doc_id(repo_url), so this is normally a
+    single document read. Documents written before that scheme (random IDs)
+    are found with a repo_url query as a fallback.
+    
+    Args:
+        db: Firestore client
+        repo_url: Repository URL
+        field_paths: Fields to fetch (all by default); pass [] when only
+            existence or the document ID is needed
+    
+    Returns:
+        The DocumentSnapshot, or None if the repository is not stored
+    """
+    doc = db.collection('repositories').document(repo_doc_id(repo_url)).get(field_paths=field_paths)
+    if doc.exists:
+        return doc
+    
+    # Legacy document with a random ID
+    query = db.collection('repositories').where('repo_url', '==', repo_url).limit(1)
+    if field_paths is not None:
+        query = query.select(field_paths)
+    docs = list(query.stream())
+    return docs[0] if docs else None
+
+# Maximum number of writes in one Firestore batch
+BATCH_LIMIT = 500
+
+class BatchWriter:
+    """
+    Queue writes into WriteBatches, committing every BATCH_LIMIT operations
+    
+    Call flush() after the last write to commit the trailing partial batch.
+    """
+    
+    def __init__(self, db):
+        self._db = db
+        self._batch = db.batch()
+        self.pending = 0
+        
+    def set(self, ref, data: Dict[str, Any], merge: bool = False):
+        self._batch.set(ref, data, merge=merge)
+        self._queued()
+        
+    def update(self, ref, data: Dict[str, Any]):
+        self._batch.update(ref, data)
+        self._queued()
+        
+    def delete(self, ref):
+        self._batch.delete(ref)
+        self._queued()
+        
+    def _queued(self):
+        self.pending += 1
+        if self.pending >= BATCH_LIMIT:
+            self.flush()
+            
+    def flush(self):
+        """Commit the queued writes, if any"""
+        if self.pending:
+            self._batch.commit()
+            self._batch = self._db.batch()
+            self.pending = 0
+
+# Collection holding one marker document per completed one-shot migration
+MIGRATIONS_COLLECTION = "_migrations"
+
+def migration_done(db, name: str) -> bool:
+    """Check whether the one-shot migration name has completed"""
+    return db.collection(MIGRATIONS_COLLECTION).document(name).get(field_paths=[]).exists
+
+def mark_migration_done(db, name: str, migrated: int):
+    """Record that the one-shot migration name has completed"""
+    db.collection(MIGRATIONS_COLLECTION).document(name).set({
+        "completed_at": firestore.SERVER_TIMESTAMP,
+        "migrated": migrated
+    })
+
+def migrate_repository_ids() -> int:
+    """
+    Re-key legacy repository documents by repo_doc_id(repo_url)
+    
+    One-shot migration for documents written with random IDs: each one is
+    copied to its hashed ID and the old document deleted, so lookups no
+    longer need the repo_url query fallback. The scan reads only repo_url,
+    and runs once: later calls return 0 after a single marker read.
+    
+    Returns:
+        int: Number of documents migrated
+    """
+    db = get_db()
+    if migration_done(db, "repository_ids"):
+        return 0
+    collection = db.collection('repositories')
+    
+    migrated = 0
+    writer = BatchWriter(db)
+    for doc in collection.select(["repo_url"]).stream():
+        repo_url = doc.to_dict().get("repo_url")
+        if not repo_url or doc.id == repo_doc_id(repo_url):
+            continue
+            
+        # Only documents being copied are read in full
+        repo = doc.reference.get().to_dict()
+        repo_id = repo_doc_id(repo_url)
+        repo["id"] = repo_id
+        writer.set(collection.document(repo_id), repo)
+        writer.delete(doc.reference)
+        migrated += 1
+    writer.flush()
+    mark_migration_done(db, "repository_ids", migrated)
+        
+    _read_cache.invalidate()
+    return migrated
+
+def migrate_metadata_to_maps() -> int:
+    """
+    Convert legacy JSON-string metadata to native Firestore maps
+    
+    One-shot migration for documents written by older versions; afterwards
+    readers never need to decode metadata. The scan reads only the metadata
+    field, and runs once: later calls return 0 after a single marker read.
+    
+    Returns:
+        int: Number of documents migrated
+    """
+    db = get_db()
+    if migration_done(db, "metadata_maps"):
+        return 0
+    
+    migrated = 0
+    writer = BatchWriter(db)
+    for doc in db.collection('repositories').select(["metadata"]).stream():
+        metadata = doc.to_dict().get("metadata")
+        if isinstance(metadata, dict):
+            continue
+        
+        # Metadata a map cannot hold stays a JSON string
+        metadata = decode_metadata(metadata)
+        if not is_map_compatible(metadata):
+            continue
+            
+        writer.update(doc.reference, {"metadata": metadata})
+        migrated += 1
+    writer.flush()
+    mark_migration_done(db, "metadata_maps", migrated)
+        
+    _read_cache.invalidate()
+    return migrated
+
+def invalidate_cache(repo_url: Optional[str] = None):
+    """
+    Drop cached repository reads
+    
+    Writes through this module invalidate automatically; call this after
+    changing the database by other means. With no argument everything is dropped.
+    """
+    _read_cache.invalidate(repo_url)
+
+def repo_document(repo_url: str, repo_data: Dict[str, Any], repo_id: str,
+                  packed: Optional[Tuple[str, Optional[bytes]]] = None) -> Dict[str, Any]:
+    """
+    Build the stored document for a repository
+    
+    Args:
+        repo_url: The GitHub repository URL
+        repo_data: Repository information
+        repo_id: Document ID stored in the id field
+        packed: (cached_json, readme_blob) already in pack_repo_data form;
+            by default they are packed from repo_data
+    """
+    # Metadata is stored as a native Firestore map, or as a JSON string
+    # (which readers also decode) if Firestore would reject it as a map
+    metadata = repo_data.get("custom_metadata") or {}
+    if not is_map_compatible(metadata):
+        metadata = json_codec.dumps(metadata)
+    cached_json, readme_blob = packed if packed is not None else pack_repo_data(repo_data)
+    
+    return {
+        "repo_url": repo_url,
+        "name": repo_data["name"],
+        "owner": repo_data["owner"]["login"],
+        "description": repo_data.get("description", ""),
+        "stars": repo_data["stars"],
+        "forks": repo_data["forks"],
+        "language": repo_data.get("language", ""),
+        "last_updated": repo_data["updated_at"],
+        "last_synced": firestore.SERVER_TIMESTAMP,
+        "metadata": metadata,
+        "cached_json": cached_json,  # Full GitHub data for the detail view
+        "readme_blob": readme_blob,
+        "id": repo_id  # Store ID for compatibility with SQLite version
+    }
+
 def add_repository(repo_url: str, repo_data: Dict[str, Any]) -> bool:
     """
     Add a new repository to the database
@@ -114,43 +438,23 @@ def add_repository(repo_url: str, repo_data: Dict[str, Any]) -> bool:
         db = get_db()
         
         # Check if repository already exists
-        repo_ref = db.collection('repositories').where('repo_url', '==', repo_url).limit(1)
-        existing_repos = list(repo_ref.stream())
-        if existing_repos:
+        if find_repo_doc(db, repo_url, field_paths=[]) is not None:
             return False  # Repository already exists
         
-        # Convert repo_data to JSON string for storage
-        metadata = json.dumps(repo_data.get("custom_metadata", {}))
-        
-        # Generate a unique ID
-        repo_id = str(uuid.uuid4())
-        
-        # Prepare repository data
-        repo_data_to_store = {
-            "repo_url": repo_url,
-            "name": repo_data["name"],
-            "owner": repo_data["owner"]["login"],
-            "description": repo_data.get("description", ""),
-            "stars": repo_data["stars"],
-            "forks": repo_data["forks"],
-            "language": repo_data.get("language", ""),
-            "last_updated": repo_data["updated_at"],
-            "last_synced": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "metadata": metadata,
-            "id": repo_id  # Store ID for compatibility with SQLite version
-        }
-        
-        # Add to database
-        db.collection('repositories').document(repo_id).set(repo_data_to_store)
-        
-        # Update technology count
-        if repo_data.get("language"):
-            update_technology(repo_data["language"])
-        
-        # Update technologies from metadata if available
-        if repo_data.get("custom_metadata", {}).get("tech_stack"):
-            for tech in repo_data["custom_metadata"]["tech_stack"]:
-                update_technology(tech)
+        # Key the document by the repository URL
+        repo_id = repo_doc_id(repo_url)
+        repo_data_to_store = repo_document(repo_url, repo_data, repo_id)
+        
+        # Write the repository and its technology counts (language and
+        # metadata tech stack) in a single batched commit
+        techs = [repo_data["language"]] if repo_data.get("language") else []
+        techs.extend(repo_data.get("custom_metadata", {}).get("tech_stack") or [])
+        
+        batch = db.batch()
+        batch.set(db.collection('repositories').document(repo_id), repo_data_to_store)
+        add_technology_writes(db, batch, techs)
+        batch.commit()
+        _read_cache.invalidate(repo_url)
                 
         return True
         
@@ -173,35 +477,20 @@ def update_repository(repo_url: str, repo_data: Dict[str, Any]) -> bool:
         db = get_db()
         
         # Check if repository exists
-        repo_ref = db.collection('repositories').where('repo_url', '==', repo_url).limit(1)
-        existing_repos = list(repo_ref.stream())
-        if not existing_repos:
+        existing_doc = find_repo_doc(db, repo_url, field_paths=["id"])
+        if existing_doc is None:
             return False  # Repository doesn't exist
         
         # Get the document ID
-        doc_id = existing_repos[0].id
-        existing_data = existing_repos[0].to_dict()
-        
-        # Convert repo_data to JSON string for storage
-        metadata = json.dumps(repo_data.get("custom_metadata", {}))
-        
-        # Prepare repository data
-        repo_data_to_store = {
-            "repo_url": repo_url,
-            "name": repo_data["name"],
-            "owner": repo_data["owner"]["login"],
-            "description": repo_data.get("description", ""),
-            "stars": repo_data["stars"],
-            "forks": repo_data["forks"],
-            "language": repo_data.get("language", ""),
-            "last_updated": repo_data["updated_at"],
-            "last_synced": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "metadata": metadata,
-            "id": existing_data.get("id", doc_id)  # Preserve ID
-        }
+        doc_id = existing_doc.id
+        existing_data = existing_doc.to_dict()
+        
+        # Prepare repository data (preserving the stored ID)
+        repo_data_to_store = repo_document(repo_url, repo_data, existing_data.get("id", doc_id))
         
         # Update in database
         db.collection('repositories').document(doc_id).update(repo_data_to_store)
+        _read_cache.invalidate(repo_url)
         
         return True
         
@@ -209,65 +498,90 @@ def update_repository(repo_url: str, repo_data: Dict[str, Any]) -> bool:
         print(f"Error updating repository: {e}")
         return False
 
-def get_all_repositories() -> List[Dict[str, Any]]:
-    """Get all repositories from the database"""
-    try:
-        db = get_db()
+def iter_repositories() -> Iterator[LazyRepo]:
+    """
+    Yield repositories, most recently synced first
+    
+    Documents are streamed from Firestore as the caller consumes them rather
+    than loaded all at once, and metadata is decoded lazily. last_synced is
+    returned as Unix seconds; documents whose stored value is not a
+    Firestore timestamp are marked with a "_legacy_timestamp" key.
+    """
+    db = get_db()
+    
+    # Newest sync first, sorted by Firestore; the compressed README is only
+    # needed by the detail view, so it is not fetched
+    query = (
+        db.collection('repositories')
+        .select(REPO_LIST_FIELDS)
+        .order_by('last_synced', direction=firestore.Query.DESCENDING)
+    )
+    
+    for doc in query.stream():
+        repo = LazyRepo(doc.to_dict())
+        repo.setdefault("metadata", None)
         
-        # Fetch all repositories
-        repos_ref = db.collection('repositories').stream()
+        if not isinstance(repo.get("last_synced"), datetime.datetime):
+            repo["_legacy_timestamp"] = True
+        repo["last_synced"] = sync_timestamp(repo.get("last_synced"))
         
-        # Process items
-        repositories = []
-        for doc in repos_ref:
-            repo = doc.to_dict()
-            
-            # Convert metadata JSON string back to dictionary
-            try:
-                repo["metadata"] = json.loads(repo["metadata"]) if repo["metadata"] else {}
-            except:
-                repo["metadata"] = {}
-            
-            # Ensure ID field exists
-            if "id" not in repo:
-                repo["id"] = doc.id
-                
-            # Add to list
-            repositories.append(repo)
+        # Ensure ID field exists
+        if "id" not in repo:
+            repo["id"] = doc.id
             
-        # Sort by last_synced in descending order
-        repositories.sort(key=lambda x: x.get("last_synced", ""), reverse=True)
+        yield repo
+
+def get_all_repositories() -> List[Dict[str, Any]]:
+    """Get all repositories from the database (served from the read cache when fresh)"""
+    hit, repositories = _read_cache.get(ALL_REPOSITORIES)
+    if hit:
+        return list(repositories)
         
-        return repositories
+    try:
+        repositories = list(iter_repositories())
+        
+        # Firestore orders numbers before timestamps before strings, so
+        # documents with legacy timestamps need a client-side sort until
+        # they are re-synced
+        legacy = [repo.pop("_legacy_timestamp", False) for repo in repositories]
+        if any(legacy):
+            repositories.sort(key=lambda x: x["last_synced"], reverse=True)
+            
+        _read_cache.set(ALL_REPOSITORIES, repositories)
+        return list(repositories)
     except Exception as e:
         print(f"Error getting repositories: {e}")
         return []
 
 def get_repository(repo_url: str) -> Optional[Dict[str, Any]]:
-    """Get a specific repository by URL"""
+    """Get a specific repository by URL (served from the read cache when fresh)"""
+    hit, repo = _read_cache.get(repo_url)
+    if hit:
+        return repo
+        
     try:
         db = get_db()
         
         # Fetch repository
-        repo_ref = db.collection('repositories').where('repo_url', '==', repo_url).limit(1)
-        docs = list(repo_ref.stream())
+        doc = find_repo_doc(db, repo_url)
         
-        if not docs:
+        if doc is None:
+            _read_cache.set(repo_url, None)
             return None
             
-        doc = docs[0]
         repo = doc.to_dict()
         
-        # Convert metadata JSON string back to dictionary
-        try:
-            repo["metadata"] = json.loads(repo["metadata"]) if repo["metadata"] else {}
-        except:
-            repo["metadata"] = {}
+        repo["metadata"] = decode_metadata(repo.get("metadata"))
+        repo["last_synced"] = sync_timestamp(repo.get("last_synced"))
+        
+        # Decompress the stored README
+        repo.update(unpack_readme(repo.pop("readme_blob", None)))
             
         # Ensure ID field exists
         if "id" not in repo:
             repo["id"] = doc.id
             
+        _read_cache.set(repo_url, repo)
         return repo
     except Exception as e:
         print(f"Error getting repository: {e}")
@@ -279,13 +593,11 @@ def delete_repository(repo_url: str) -> bool:
         db = get_db()
         
         # Check if repository exists
-        repo_ref = db.collection('repositories').where('repo_url', '==', repo_url).limit(1)
-        docs = list(repo_ref.stream())
+        doc = find_repo_doc(db, repo_url, field_paths=["language"])
         
-        if not docs:
+        if doc is None:
             return False
             
-        doc = docs[0]
         repo = doc.to_dict()
             
         # Update technology count if needed
@@ -294,64 +606,149 @@ def delete_repository(repo_url: str) -> bool:
         
         # Delete repository
         db.collection('repositories').document(doc.id).delete()
+        _read_cache.invalidate(repo_url)
         
         return True
     except Exception as e:
         print(f"Error deleting repository: {e}")
         return False
 
+def tech_doc_id(name: str) -> str:
+    """Document ID for a technology: the SHA1 hex digest of its name"""
+    return hashlib.sha1(name.encode("utf-8")).hexdigest()
+
 def update_technology(name: str):
     """Increment the count for a technology"""
+    update_technologies([name])
+
+def add_technology_writes(db, batch, names: List[str]):
+    """
+    Add technology count increments to a write batch
+    
+    Technology documents are keyed by tech_doc_id(name) and incremented
+    with the server-side Increment transform, so no read is needed and
+    concurrent writers cannot lose updates. Empty names are skipped, and a
+    name appearing more than once is incremented once per occurrence.
+    """
+    increments = Counter(name for name in names if name)
+    collection = db.collection('technologies')
+    for name, count in increments.items():
+        batch.set(collection.document(tech_doc_id(name)), {
+            'name': name,
+            'count': firestore.Increment(count)
+        }, merge=True)
+
+def update_technologies(names: List[str]):
+    """Increment the counts for several technologies with one batched write"""
+    if not names:
+        return
+        
     try:
         db = get_db()
-        
-        # Check if technology exists
-        tech_ref = db.collection('technologies').where('name', '==', name).limit(1)
-        docs = list(tech_ref.stream())
-        
-        if docs:
-            # Update count
-            doc = docs[0]
-            tech = doc.to_dict()
-            db.collection('technologies').document(doc.id).update({
-                'count': tech.get('count', 0) + 1
-            })
-        else:
-            # Insert new technology
-            db.collection('technologies').add({
-                'name': name, 
-                'count': 1
-            })
+        batch = db.batch()
+        add_technology_writes(db, batch, names)
+        batch.commit()
             
     except Exception as e:
-        print(f"Error updating technology: {e}")
+        print(f"Error updating technologies: {e}")
+
+@firestore.transactional
+def _delete_if_unused(transaction, tech_ref):
+    """Delete a technology document whose count has dropped to zero"""
+    snapshot = tech_ref.get(transaction=transaction)
+    if snapshot.exists and snapshot.to_dict().get('count', 0) <= 0:
+        transaction.delete(tech_ref)
 
 def decrease_technology_count(name: str):
     """Decrease the count for a technology"""
     try:
         db = get_db()
+        tech_ref = db.collection('technologies').document(tech_doc_id(name))
         
-        # Check if technology exists
-        tech_ref = db.collection('technologies').where('name', '==', name).limit(1)
-        docs = list(tech_ref.stream())
-        
-        if docs:
-            doc = docs[0]
-            tech = doc.to_dict()
-            current_count = tech.get('count', 0)
-            
-            if current_count <= 1:
-                # Remove if count will be zero
-                db.collection('technologies').document(doc.id).delete()
-            else:
-                # Decrease count
-                db.collection('technologies').document(doc.id).update({
-                    'count': current_count - 1
-                })
+        try:
+            tech_ref.update({'count': firestore.Increment(-1)})
+        except google_exceptions.NotFound:
+            # Counted in a document written before technologies were keyed by name
+            _decrease_legacy_technology_count(db, name)
+            return
+        
+        # Rare path: remove the technology once nothing uses it
+        _delete_if_unused(db.transaction(), tech_ref)
             
     except Exception as e:
         print(f"Error decreasing technology count: {e}")
 
+def _decrease_legacy_technology_count(db, name: str):
+    """Decrease the count in a technology document with a random ID"""
+    # Check if technology exists
+    tech_ref = db.collection('technologies').where('name', '==', name).limit(1).select(['count'])
+    docs = list(tech_ref.stream())
+    
+    if docs:
+        doc = docs[0]
+        tech = doc.to_dict()
+        current_count = tech.get('count', 0)
+        
+        if current_count <= 1:
+            # Remove if count will be zero
+            db.collection('technologies').document(doc.id).delete()
+        else:
+            # Decrease count
+            db.collection('technologies').document(doc.id).update({
+                'count': current_count - 1
+            })
+
+def recompute_technology_counts() -> int:
+    """
+    Rebuild the technology counts from the stored repositories
+    
+    Repositories are read in pages of BATCH_LIMIT (only the language and
+    metadata fields) and counted locally; the name-keyed technology
+    documents are then rewritten in batches and any other technology
+    documents (legacy random IDs, unused names) are deleted. Use after bulk
+    imports or to repair drifted counts.
+    
+    Returns:
+        int: Number of technologies, or -1 on error
+    """
+    try:
+        db = get_db()
+        repos_ref = db.collection('repositories')
+        techs_ref = db.collection('technologies')
+        
+        # Count languages and metadata tech stacks, one page at a time
+        counts = Counter()
+        query = repos_ref.select(["language", "metadata"]).order_by('__name__').limit(BATCH_LIMIT)
+        last = None
+        while True:
+            page = query.start_after(last) if last is not None else query
+            docs = list(page.stream())
+            for doc in docs:
+                repo = doc.to_dict()
+                techs = [repo["language"]] if repo.get("language") else []
+                techs.extend(decode_metadata(repo.get("metadata")).get("tech_stack") or [])
+                counts.update(name for name in techs if name)
+            if len(docs) < BATCH_LIMIT:
+                break
+            last = docs[-1]
+        
+        # Write the counts, then delete documents that are no longer wanted
+        writer = BatchWriter(db)
+        wanted = set()
+        for name, count in counts.items():
+            ref = techs_ref.document(tech_doc_id(name))
+            writer.set(ref, {'name': name, 'count': count})
+            wanted.add(ref.id)
+        for doc in techs_ref.select([]).stream():
+            if doc.id not in wanted:
+                writer.delete(doc.reference)
+        writer.flush()
+            
+        return len(counts)
+    except Exception as e:
+        print(f"Error recomputing technology counts: {e}")
+        return -1
+
 def get_technology_stats() -> List[Dict[str, Any]]:
     """Get statistics for all technologies"""
     try:
@@ -360,14 +757,18 @@ def get_technology_stats() -> List[Dict[str, Any]]:
         # Fetch all technologies
         tech_ref = db.collection('technologies').stream()
         
-        # Convert to list of dictionaries
-        stats = []
+        # Sum counts per name (a technology may still have a legacy
+        # random-ID document next to its name-keyed one)
+        counts = Counter()
         for doc in tech_ref:
             tech = doc.to_dict()
-            stats.append({
-                'name': tech.get('name', ''),
-                'count': tech.get('count', 0)
-            })
+            counts[tech.get('name', '')] += tech.get('count', 0)
+        
+        # Convert to list of dictionaries
+        stats = [
+            {'name': name, 'count': count}
+            for name, count in counts.items() if count > 0
+        ]
             
         # Sort by count in descending order
         stats.sort(key=lambda x: x['count'], reverse=True)
@@ -0,0 +1,37 @@
+"""
+JSON encoding helpers for RepoSpotlight
+
+Uses orjson when it is installed (several times faster on the large
+repository payloads stored by the database backends) and falls back to the
+standard library json module otherwise. Values that are not natively
+serializable (e.g. datetimes) are encoded with str().
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps_bytes(obj) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str).encode("utf-8")
+
+def dumps(obj) -> str:
+    """Serialize obj to a JSON string"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, default=str)
+
+def loads(data):
+    """
+    Deserialize JSON from str or bytes
+
+    Raises:
+        ValueError: If data is not valid JSON (both backends raise a subclass)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -11,116 +11,430 @@ Usage:
 
 import os
 import sys
+import asyncio
+import hashlib
 import json
+import operator
 import sqlite3
+from itertools import islice
 import streamlit as st
 
 # Add the current directory to the path so we can import our modules
 sys.path.append('.')
 
+# Rows read from SQLite per page
+PAGE_SIZE = 500
+
+# Repository pages queued before waiting for the writes and saving the
+# checkpoint
+PAGES_PER_FLUSH = 20
+
+# Attempts for a write before it is reported as failed (BulkWriter retries
+# with exponential backoff)
+RETRY_ATTEMPTS = 5
+
+# Records the id of the last SQLite repository migrated, so an interrupted
+# migration resumes where it stopped; removed once the migration completes
+CHECKPOINT_PATH = ".migrate.ckpt"
+
+# Progress lines buffered before they are written to stdout in one call
+LOG_FLUSH_LINES = 100
+
+_log_lines = []
+
+def flush_log():
+    """Write the buffered progress lines to stdout"""
+    if _log_lines:
+        sys.stdout.write("\n".join(_log_lines) + "\n")
+        sys.stdout.flush()
+        _log_lines.clear()
+
+def log(message: str):
+    """Buffer a progress line, writing the buffer once it is full"""
+    _log_lines.append(message)
+    if len(_log_lines) >= LOG_FLUSH_LINES:
+        flush_log()
+
+def read_checkpoint() -> int:
+    """Return the last migrated repository id (0 to start from the beginning)"""
+    try:
+        with open(CHECKPOINT_PATH) as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+def write_checkpoint(last_id: int):
+    """
+    Record the last migrated repository id
+    
+    Written to a temporary file and renamed over the checkpoint, so an
+    interruption mid-write never leaves a truncated id behind.
+    """
+    tmp_path = CHECKPOINT_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(str(last_id))
+    os.replace(tmp_path, CHECKPOINT_PATH)
+
+def chunks(iterable, n):
+    """Yield successive lists of up to n items, consuming iterable lazily"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, n))
+        if not chunk:
+            return
+        yield chunk
+
+def open_bulk_writer(db, failures: list):
+    """
+    Create a BulkWriter for the migration
+    
+    The BulkWriter batches, parallelizes and rate-limits the writes itself.
+    Failed writes are retried with exponential backoff up to RETRY_ATTEMPTS
+    times, then appended to failures.
+    """
+    from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriterOptions
+    bulk_writer = db.bulk_writer(options=BulkWriterOptions(retry=BulkRetry.exponential))
+    
+    def on_write_error(error, _bulk_writer) -> bool:
+        if error.attempts < RETRY_ATTEMPTS:
+            return True
+        failures.append(error)
+        return False
+        
+    bulk_writer.on_write_error(on_write_error)
+    return bulk_writer
+
+def flush_writes(bulk_writer, failures: list):
+    """Wait for every queued write, raising if any of them failed"""
+    bulk_writer.flush()
+    if failures:
+        raise RuntimeError(f"{len(failures)} writes failed, first error: {failures[0].message}")
+
+def iter_repository_pages(source, after: int):
+    """
+    Yield pages of SQLite repositories with an id greater than after, in id order
+    
+    Each page is a list of (repo, readme_blob) pairs; the README is copied
+    as stored, so it is read alongside the row.
+    """
+    import database as sqlite_db
+    page_sql = (
+        f"SELECT {sqlite_db.REPO_ROW_COLUMNS}, readme_blob FROM repositories "
+        "WHERE id > ? ORDER BY id LIMIT ?"
+    )
+    while True:
+        page = [
+            (sqlite_db.Repo._make(row[:-1]), row[-1])
+            for row in source.execute(page_sql, (after, PAGE_SIZE))
+        ]
+        if not page:
+            return
+        yield page
+        after = page[-1][0].id
+
+# SQLite row fields copied to Firebase, in the order they are hashed
+MIGRATED_FIELDS = operator.attrgetter(
+    "repo_url", "name", "owner", "description", "stars", "forks",
+    "language", "last_updated", "metadata", "cached_json"
+)
+
+def content_hash(repo, readme_blob) -> str:
+    """
+    SHA256 hex digest of the migrated fields of a SQLite repository row
+    
+    The fields (metadata decoded, whichever format it is stored in) are
+    serialized as canonical JSON with the standard library, so the digest
+    does not depend on whether orjson is installed.
+    """
+    canonical = json.dumps(
+        MIGRATED_FIELDS(repo), sort_keys=True, separators=(",", ":"),
+        ensure_ascii=False, default=str
+    )
+    digest = hashlib.sha256(canonical.encode("utf-8"))
+    digest.update(readme_blob or b"")
+    return digest.hexdigest()
+
+async def find_existing(async_db, pages):
+    """
+    Find which repositories of each page already exist in Firebase
+    
+    Each page is checked with one get_all read on the async client (only
+    the content_hash field is fetched), and the reads for all pages run
+    concurrently.
+    
+    Returns:
+        One dict per page mapping existing document IDs to their stored
+        content hash (None for documents not written by this script)
+    """
+    import firebase_database as firebase_db
+    repos_ref = async_db.collection('repositories')
+    
+    async def read(page):
+        refs = [repos_ref.document(firebase_db.repo_doc_id(repo.repo_url)) for repo, _ in page]
+        return {
+            snapshot.id: (snapshot.to_dict() or {}).get("content_hash")
+            async for snapshot in async_db.get_all(refs, field_paths=["content_hash"])
+            if snapshot.exists
+        }
+        
+    return await asyncio.gather(*(read(page) for page in pages))
+
+def migrate_repository_page(db, bulk_writer, page, existing):
+    """
+    Queue one page of SQLite repositories on the BulkWriter
+    
+    A repository is written if it is not in Firebase yet, or if it was
+    migrated before and its content hash has changed since. Documents added
+    through the app (no stored hash) are left alone.
+    
+    Returns:
+        List of the names of the repositories queued
+    """
+    import firebase_database as firebase_db
+    repos_ref = db.collection('repositories')
+    refs = [repos_ref.document(firebase_db.repo_doc_id(repo.repo_url)) for repo, _ in page]
+    
+    names = []
+    for (repo, readme_blob), ref in zip(page, refs):
+        # Rows that are skipped never have a document built
+        digest = content_hash(repo, readme_blob)
+        if ref.id in existing:
+            stored = existing[ref.id]
+            if stored is None or stored == digest:
+                log(f"- Repository already exists in Firebase: {repo.name}")
+                continue
+        
+        # Create repo_data structure similar to what add_repository expects
+        repo_data = {
+            "name": repo.name,
+            "owner": {"login": repo.owner},
+            "description": repo.description,
+            "stars": repo.stars,
+            "forks": repo.forks,
+            "language": repo.language,
+            "updated_at": repo.last_updated,
+            "custom_metadata": repo.metadata
+        }
+        # The stored GitHub data and README are copied as they are (both
+        # backends pack them the same way); repo_data above only has the
+        # basic fields, so it must not be packed as the detail view's data.
+        # Rows without stored data keep an empty cached_json, which the
+        # detail view shows as basic info with a Refresh hint.
+        document = firebase_db.repo_document(
+            repo.repo_url, repo_data, ref.id, packed=(repo.cached_json or "", readme_blob)
+        )
+        document["content_hash"] = digest
+        bulk_writer.set(ref, document)
+        names.append(repo.name)
+    return names
+
+async def migrate_repositories(db, async_db, source, bulk_writer, failures: list) -> int:
+    """
+    Migrate repositories in id order, resuming after the checkpoint
+    
+    For each window of PAGES_PER_FLUSH pages the existence checks run
+    concurrently, the new documents are queued on the BulkWriter, and once
+    the writes have completed the checkpoint file is updated.
+    
+    Returns:
+        int: Number of SQLite repositories processed
+    """
+    last_id = read_checkpoint()
+    if last_id:
+        log(f"Resuming after repository id {last_id}")
+    log("🔄 Migrating repositories from SQLite to Firebase...")
+    repo_count = 0
+    for window in chunks(iter_repository_pages(source, last_id), PAGES_PER_FLUSH):
+        existing = await find_existing(async_db, window)
+        names = []
+        for page, existing_ids in zip(window, existing):
+            names.extend(migrate_repository_page(db, bulk_writer, page, existing_ids))
+            repo_count += len(page)
+        await asyncio.to_thread(flush_writes, bulk_writer, failures)
+        for name in names:
+            log(f"✅ Migrated: {name}")
+        write_checkpoint(window[-1][-1][0].id)
+        flush_log()
+    return repo_count
+
+def technology_groups(rows, legacy):
+    """
+    Split technology rows into groups of at most BATCH_LIMIT writes
+    
+    A name's document and the deletions of its legacy documents are never
+    split across groups.
+    """
+    import firebase_database as firebase_db
+    group, writes = [], 0
+    for name, count in rows:
+        needed = 1 + len(legacy.get(name, ()))
+        if group and writes + needed > firebase_db.BATCH_LIMIT:
+            yield group
+            group, writes = [], 0
+        group.append((name, count))
+        writes += needed
+    if group:
+        yield group
+
+def write_technologies(db, rows, legacy):
+    """
+    Write a group of technologies in one transaction
+    
+    Each name-keyed document is written together with the deletion of that
+    name's legacy documents, so get_technology_stats never sums a migrated
+    count with a legacy one. The transaction only writes, so it commits in
+    one round-trip and is retried up to RETRY_ATTEMPTS times on contention.
+    """
+    from firebase_admin import firestore
+    import firebase_database as firebase_db
+    techs_ref = db.collection('technologies')
+    
+    @firestore.transactional
+    def write(transaction):
+        for name, count in rows:
+            transaction.set(techs_ref.document(firebase_db.tech_doc_id(name)), {
+                'name': name,
+                'count': count
+            })
+            for ref in legacy.get(name, ()):
+                transaction.delete(ref)
+                
+    write(db.transaction(max_attempts=RETRY_ATTEMPTS))
+
+def find_legacy_technologies(db):
+    """
+    Find technology documents with random IDs
+    
+    They are replaced by the migrated name-keyed documents, so their counts
+    are not added to the migrated ones.
+    
+    Returns:
+        Dict mapping technology names to their legacy document references
+    """
+    import firebase_database as firebase_db
+    legacy = {}
+    for doc in db.collection('technologies').select(['name']).stream():
+        name = doc.to_dict().get('name')
+        if name and doc.id != firebase_db.tech_doc_id(name):
+            legacy.setdefault(name, []).append(doc.reference)
+    return legacy
+
+async def migrate_technologies(db, source) -> int:
+    """
+    Migrate the technology counts
+    
+    SQLite rows are read on the event loop thread, which owns the source
+    connection; the Firestore reads and transactions run in a worker thread.
+    
+    Returns:
+        int: Number of SQLite technologies processed
+    """
+    log("🔄 Migrating technologies from SQLite to Firebase...")
+    legacy = await asyncio.to_thread(find_legacy_technologies, db)
+    
+    # Rows are plain tuples (the source connection has no row factory)
+    # fetched PAGE_SIZE at a time
+    cursor = source.cursor()
+    cursor.arraysize = PAGE_SIZE
+    cursor.execute("SELECT name, count FROM technologies")
+    tech_count = 0
+    while chunk := cursor.fetchmany():
+        for group in technology_groups(chunk, legacy):
+            await asyncio.to_thread(write_technologies, db, group, legacy)
+        tech_count += len(chunk)
+    return tech_count
+
+async def migrate_collections(db, async_db, source, bulk_writer, failures: list):
+    """
+    Migrate repositories and technologies concurrently
+    
+    The two phases write disjoint collections, so their Firestore round-trips
+    can overlap. Progress is only logged from the event loop thread, so the
+    shared log buffer needs no lock.
+    
+    Returns:
+        (repository count, technology count)
+    """
+    return await asyncio.gather(
+        migrate_repositories(db, async_db, source, bulk_writer, failures),
+        migrate_technologies(db, source)
+    )
+
 def migrate_from_sqlite_to_firebase():
     """Migrate all data from local SQLite database to Firebase Firestore"""
     # Import our database modules
     import database as sqlite_db
     import firebase_database as firebase_db
     
-    print("🚀 Starting migration from SQLite to Firebase...")
+    log("🚀 Starting migration from SQLite to Firebase...")
     
     # Check if Firebase is properly configured
     try:
         firebase_db.init_firebase()
     except Exception as e:
-        print(f"❌ Firebase initialization failed: {e}")
-        print("Please set up your Firebase credentials before running this script.")
+        log(f"❌ Firebase initialization failed: {e}")
+        log("Please set up your Firebase credentials before running this script.")
+        flush_log()
         return False
     
     # Check if SQLite database exists
     if not os.path.exists(sqlite_db.DB_PATH):
-        print(f"❌ SQLite database not found at {sqlite_db.DB_PATH}")
+        log(f"❌ SQLite database not found at {sqlite_db.DB_PATH}")
+        flush_log()
         return False
     
+    # One read-only source connection serves both tables, tuned like the
+    # app's connections (memory-mapped reads, larger page cache); the same
+    # page query is reused (and served from the statement cache) for every page
+    source = sqlite3.connect(sqlite_db.DB_PATH)
+    source.executescript(sqlite_db.CONNECTION_PRAGMAS)
+    source.execute("PRAGMA query_only = 1")
+    
     try:
-        # Get repositories from SQLite
-        print("📊 Reading repositories from SQLite...")
-        repositories = sqlite_db.get_all_repositories()
-        print(f"Found {len(repositories)} repositories")
+        db = firebase_db.get_db()
         
-        # Migrate repositories to Firebase
-        print("🔄 Migrating repositories to Firebase...")
-        for repo in repositories:
-            # Get the repo URL
-            repo_url = repo["repo_url"]
-            
-            # Check if repo already exists in Firebase
-            existing_repo = firebase_db.get_repository(repo_url)
-            if existing_repo:
-                print(f"- Repository already exists in Firebase: {repo['name']}")
-                continue
-            
-            # Convert metadata back to dict for storage
-            try:
-                if isinstance(repo["metadata"], str):
-                    repo["metadata"] = json.loads(repo["metadata"])
-            except:
-                repo["metadata"] = {}
-            
-            # Create repo_data structure similar to what add_repository expects
-            repo_data = {
-                "name": repo["name"],
-                "owner": {"login": repo["owner"]},
-                "description": repo["description"],
-                "stars": repo["stars"],
-                "forks": repo["forks"],
-                "language": repo["language"],
-                "updated_at": repo["last_updated"],
-                "custom_metadata": repo["metadata"]
-            }
-            
-            # Add to Firebase
-            if firebase_db.add_repository(repo_url, repo_data):
-                print(f"✅ Migrated: {repo['name']}")
-            else:
-                print(f"❌ Failed to migrate: {repo['name']}")
+        # Documents written with random IDs are re-keyed first so the
+        # existence checks below can use direct document reads. This and the
+        # metadata conversion run once; later runs only read their markers
+        migrated_ids = firebase_db.migrate_repository_ids()
+        if migrated_ids:
+            log(f"Re-keyed {migrated_ids} existing Firebase repositories")
         
-        # Get technologies from SQLite
-        print("\n📊 Reading technologies from SQLite...")
-        conn = sqlite_db.get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT name, count FROM technologies")
-        technologies = [{"name": row[0], "count": row[1]} for row in cursor.fetchall()]
-        conn.close()
+        # Metadata stored as JSON strings by older versions becomes a native
+        # map, like the documents written below
+        converted = firebase_db.migrate_metadata_to_maps()
+        if converted:
+            log(f"Converted metadata of {converted} existing Firebase repositories to maps")
         
-        print(f"Found {len(technologies)} technologies")
+        # All writes go through one BulkWriter; existence reads use the
+        # async client so a window's reads are in flight together
+        failures = []
+        bulk_writer = open_bulk_writer(db, failures)
+        try:
+            from firebase_admin import firestore_async
+            async_db = firestore_async.client()
+            repo_count, tech_count = asyncio.run(
+                migrate_collections(db, async_db, source, bulk_writer, failures)
+            )
+            log(f"Processed {repo_count} repositories")
+            log(f"Processed {tech_count} technologies")
+        finally:
+            bulk_writer.close()
         
-        # Migrate technologies to Firebase
-        print("🔄 Migrating technologies to Firebase...")
-        db = firebase_db.get_db()
-        for tech in technologies:
-            # Check if technology exists in Firebase
-            tech_ref = db.collection('technologies').where('name', '==', tech["name"]).limit(1)
-            docs = list(tech_ref.stream())
-            
-            if docs:
-                # Update count
-                doc = docs[0]
-                db.collection('technologies').document(doc.id).update({
-                    'count': tech["count"]
-                })
-            else:
-                # Insert new technology
-                db.collection('technologies').add({
-                    'name': tech["name"], 
-                    'count': tech["count"]
-                })
-            print(f"✅ Migrated technology: {tech['name']} (count: {tech['count']})")
+        # Everything is migrated; the next run starts from the beginning
+        if os.path.exists(CHECKPOINT_PATH):
+            os.remove(CHECKPOINT_PATH)
         
-        print("\n🎉 Migration completed successfully!")
-        print("\nYou can now deploy your app to Streamlit Cloud with Firebase storage.")
+        log("\n🎉 Migration completed successfully!")
+        log("\nYou can now deploy your app to Streamlit Cloud with Firebase storage.")
         return True
         
     except Exception as e:
-        print(f"❌ Migration failed: {e}")
+        log(f"❌ Migration failed: {e}")
         return False
+    finally:
+        source.close()
+        flush_log()
 
 if __name__ == "__main__":
     migrate_from_sqlite_to_firebase()
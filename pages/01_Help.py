@@ -1,5 +1,11 @@
 import streamlit as st
-import json
+import json_codec
+
+@st.cache_data
+def load_example_metadata():
+    """Load the example metadata file (parsed once and shared across reruns)"""
+    with open("example_metadata.json", "rb") as f:
+        return json_codec.loads(f.read())
 
 def main():
     st.set_page_config(
@@ -44,9 +50,7 @@ def main():
     """)
     
     with st.expander("View Example Metadata"):
-        with open("example_metadata.json", "r") as f:
-            metadata = json.load(f)
-        st.json(metadata)
+        st.json(load_example_metadata())
     
     st.header("Troubleshooting")
     
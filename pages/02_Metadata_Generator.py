@@ -1,6 +1,13 @@
 import streamlit as st
 import json
 
+# Fields collected for each contributor, with their column labels
+CONTRIBUTOR_COLUMNS = {
+    "name": st.column_config.TextColumn("Name"),
+    "github": st.column_config.TextColumn("GitHub Username"),
+    "role": st.column_config.TextColumn("Role"),
+}
+
 def main():
     st.set_page_config(
         page_title="RepoSpotlight - Metadata Generator",
@@ -43,22 +50,23 @@ def main():
         linkedin = st.text_input("LinkedIn Profile", placeholder="your_linkedin")
         
         st.subheader("Contributors")
-        st.markdown("Add at least one contributor (yourself)")
+        st.markdown("Add at least one contributor (yourself); add rows for more")
         
-        contributors = []
+        # One editable grid instead of three text inputs per contributor
+        rows = st.data_editor(
+            [dict.fromkeys(CONTRIBUTOR_COLUMNS, "") for _ in range(3)],
+            column_config=CONTRIBUTOR_COLUMNS,
+            num_rows="dynamic",
+            hide_index=True,
+            key="contributors"
+        )
         
-        for i in range(3):  # Allow up to 3 contributors in the form
-            st.markdown(f"### Contributor {i+1}")
-            name = st.text_input(f"Name {i+1}", key=f"name_{i}")
-            github = st.text_input(f"GitHub Username {i+1}", key=f"github_{i}")
-            role = st.text_input(f"Role {i+1}", key=f"role_{i}")
-            
-            if name and github and role:
-                contributors.append({
-                    "name": name,
-                    "github": github,
-                    "role": role
-                })
+        # Keep only fully filled-in contributors
+        contributors = [
+            {field: row[field] for field in CONTRIBUTOR_COLUMNS}
+            for row in rows
+            if all(row.get(field) for field in CONTRIBUTOR_COLUMNS)
+        ]
     
     if st.button("Generate JSON"):
         # Parse features and tech stack from text areas
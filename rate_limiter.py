@@ -0,0 +1,61 @@
+"""
+Token-bucket rate limiter for GitHub API calls made by RepoSpotlight
+
+Every outbound request acquires capacity from a shared bucket first, so bursts
+(e.g. "Refresh All") are smoothed to the sustained rate GitHub allows instead
+of tripping the secondary rate limit.
+"""
+import threading
+import time
+from typing import Optional
+
+# GitHub's primary rate limit for authenticated requests (per hour)
+GITHUB_REQUESTS_PER_HOUR = 5000
+
+class RateLimiter:
+    """
+    Token bucket limiting requests (and optionally tokens) per minute
+
+    Capacity refills continuously at rpm/60 per second up to a maximum of
+    rpm, so up to one minute's worth of requests can be issued in a burst.
+    """
+
+    def __init__(self, rpm: float, tpm: Optional[float] = None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.request_tokens = rpm
+        self.token_tokens = tpm
+        self.last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add the capacity accumulated since the last update"""
+        elapsed = now - self.last_update
+        self.request_tokens = min(self.rpm, self.request_tokens + self.rpm * elapsed / 60.0)
+        if self.tpm is not None:
+            self.token_tokens = min(self.tpm, self.token_tokens + self.tpm * elapsed / 60.0)
+        self.last_update = now
+
+    def acquire(self, estimated_tokens: int = 1):
+        """Block until capacity for one request is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                has_tokens = self.tpm is None or self.token_tokens >= estimated_tokens
+                if self.request_tokens >= 1 and has_tokens:
+                    self.request_tokens -= 1
+                    if self.tpm is not None:
+                        self.token_tokens -= estimated_tokens
+                    return
+
+                # Time until both buckets hold enough capacity
+                wait = (1 - self.request_tokens) * 60.0 / self.rpm if self.request_tokens < 1 else 0.0
+                if not has_tokens:
+                    wait = max(wait, (estimated_tokens - self.token_tokens) * 60.0 / self.tpm)
+
+            time.sleep(wait)
+
+# Shared limiter for all GitHub API calls in this process
+limiter = RateLimiter(rpm=GITHUB_REQUESTS_PER_HOUR / 60)
@@ -0,0 +1,69 @@
+"""
+Process-local read cache for RepoSpotlight database backends
+
+Streamlit re-executes the app on every interaction, so the same repository
+queries are issued over and over. The backends keep recent results here and
+invalidate them whenever a repository is added, updated or deleted.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+# Default time-to-live for cached reads (in seconds)
+DEFAULT_TTL = 60.0
+
+# Default maximum number of cached entries
+DEFAULT_MAXSIZE = 512
+
+# Cache key for the full repository list
+ALL_REPOSITORIES = ("__all__",)
+
+class ReadCache:
+    """Thread-safe TTL cache with least-recently-used eviction"""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a cached value
+
+        Returns:
+            (hit, value): hit is False if the key is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            stored_at, value = entry
+            if time.monotonic() - stored_at >= self.ttl:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, repo_url: Optional[str] = None):
+        """
+        Drop cached reads affected by a change to repo_url
+
+        Removes the entry for repo_url and the full repository list;
+        with no argument the whole cache is cleared.
+        """
+        with self._lock:
+            if repo_url is None:
+                self._entries.clear()
+                return
+            self._entries.pop(repo_url, None)
+            self._entries.pop(ALL_REPOSITORIES, None)
@@ -0,0 +1,137 @@
+"""
+On-disk cache for GitHub API responses used by RepoSpotlight
+
+Responses are stored in a small SQLite table keyed by a SHA256 digest of
+the token fingerprint and owner/repository/endpoint, so repeated renders and
+refreshes can be served without another round-trip to the GitHub API, and
+data fetched with one token is never served to another (or to anonymous
+requests).
+"""
+import hashlib
+import json_codec
+import sqlite3
+import time
+from typing import Any, Callable, Optional, Tuple
+
+# Cache database file path (kept separate from the application database)
+CACHE_PATH = "github_cache.db"
+
+# Cache lock timeout (in seconds)
+CACHE_TIMEOUT = 10.0
+
+# Default time-to-live for cached responses (in seconds)
+DEFAULT_TTL = 300
+
+# Supported cache modes:
+# - enabled:   serve fresh entries, fetch and store on miss or expiry
+# - read-only: serve fresh entries, fetch on miss but never write
+# - replay:    serve any stored entry regardless of age, fetch and store on miss
+# - disabled:  always fetch, never read or write the cache
+CACHE_MODES = ("enabled", "read-only", "replay", "disabled")
+DEFAULT_MODE = "enabled"
+
+def token_fingerprint(access_token: str = "") -> str:
+    """Identify the token a response was fetched with, without storing the token"""
+    if not access_token:
+        return "anon"
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+def cache_key(owner: str, repo_name: str, endpoint: str, access_token: str = "") -> str:
+    """Build the cache key for a repository endpoint fetched with access_token"""
+    fingerprint = token_fingerprint(access_token)
+    return hashlib.sha256(f"{fingerprint}:{owner}/{repo_name}:{endpoint}".encode()).hexdigest()
+
+def get_cache_connection():
+    """Create a connection to the cache database, creating the table if needed"""
+    try:
+        conn = sqlite3.connect(CACHE_PATH, timeout=CACHE_TIMEOUT)
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            payload BLOB,
+            fetched_at REAL,
+            etag TEXT
+        )
+        ''')
+        return conn
+    except sqlite3.Error as e:
+        print(f"Cache connection error: {e}")
+        return None
+
+def lookup(key: str) -> Optional[Tuple[Any, float, Optional[str]]]:
+    """
+    Read a cached entry
+
+    Returns:
+        (payload, fetched_at, etag) or None if the key is not cached
+    """
+    conn = get_cache_connection()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute(
+            "SELECT payload, fetched_at, etag FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        return json_codec.loads(row[0]), row[1], row[2]
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Error reading cache entry: {e}")
+        return None
+    finally:
+        conn.close()
+
+def store(key: str, payload: Any, etag: Optional[str] = None):
+    """Write (or replace) a cached entry"""
+    conn = get_cache_connection()
+    if conn is None:
+        return
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, payload, fetched_at, etag) VALUES (?, ?, ?, ?)",
+            (key, json_codec.dumps_bytes(payload), time.time(), etag)
+        )
+        conn.commit()
+    except (sqlite3.Error, TypeError) as e:
+        print(f"Error writing cache entry: {e}")
+    finally:
+        conn.close()
+
+def cached(key: str, ttl: float, fn: Callable[[], Any], mode: Optional[str] = None) -> Any:
+    """
+    Return the cached value for key, calling fn() to populate it when needed
+
+    Args:
+        key: Cache key (see cache_key)
+        ttl: Maximum age in seconds of an entry that may be served
+        fn: Zero-argument callable producing a JSON-serializable value
+        mode: One of CACHE_MODES (defaults to "enabled")
+
+    Returns:
+        The cached or freshly fetched value
+    """
+    mode = mode if mode in CACHE_MODES else DEFAULT_MODE
+    if mode == "disabled":
+        return fn()
+
+    entry = lookup(key)
+    if entry is not None:
+        payload, fetched_at, _ = entry
+        if mode == "replay" or time.time() - fetched_at < ttl:
+            return payload
+
+    value = fn()
+    if mode != "read-only":
+        store(key, value)
+    return value
+
+def clear_cache():
+    """Remove all cached responses"""
+    conn = get_cache_connection()
+    if conn is None:
+        return
+    try:
+        conn.execute("DELETE FROM responses")
+        conn.commit()
+    finally:
+        conn.close()
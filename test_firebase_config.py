@@ -1,11 +1,15 @@
 """
 Test script to verify Firebase credentials are properly configured
 """
-import streamlit as st
 import firebase_admin
 from firebase_admin import credentials, firestore
 import os
 import json
+from app_secrets import streamlit_secret
+
+# Collection and timeout (in seconds) for the connectivity check read
+HEALTHCHECK_COLLECTION = "_healthcheck"
+HEALTHCHECK_TIMEOUT = 2.0
 
 def test_firebase_connection():
     """
@@ -18,58 +22,55 @@ def test_firebase_connection():
     firebase_creds_env = os.environ.get("FIREBASE_CREDENTIALS")
     firebase_path_env = os.environ.get("FIREBASE_CREDENTIALS_PATH")
     
-    # Check for credentials in Streamlit secrets
-    firebase_creds_secret = st.secrets.get("FIREBASE_CREDENTIALS") if hasattr(st, "secrets") else None
-    firebase_path_secret = st.secrets.get("FIREBASE_CREDENTIALS_PATH") if hasattr(st, "secrets") else None
+    # Check for credentials in Streamlit secrets (read once and memoized)
+    firebase_creds_secret = streamlit_secret("FIREBASE_CREDENTIALS")
+    firebase_path_secret = streamlit_secret("FIREBASE_CREDENTIALS_PATH")
     
-    print("\nCredential Sources:")
-    print(f"- Environment FIREBASE_CREDENTIALS: {'Found' if firebase_creds_env else 'Not found'}")
-    print(f"- Environment FIREBASE_CREDENTIALS_PATH: {'Found' if firebase_path_env else 'Not found'}")
-    print(f"- Streamlit Secrets FIREBASE_CREDENTIALS: {'Found' if firebase_creds_secret else 'Not found'}")
-    print(f"- Streamlit Secrets FIREBASE_CREDENTIALS_PATH: {'Found' if firebase_path_secret else 'Not found'}")
+    sources = [
+        ("Environment FIREBASE_CREDENTIALS", firebase_creds_env),
+        ("Environment FIREBASE_CREDENTIALS_PATH", firebase_path_env),
+        ("Streamlit Secrets FIREBASE_CREDENTIALS", firebase_creds_secret),
+        ("Streamlit Secrets FIREBASE_CREDENTIALS_PATH", firebase_path_secret),
+    ]
+    print("\nCredential Sources:\n" + "\n".join(
+        f"- {label}: {'Found' if value else 'Not found'}" for label, value in sources
+    ))
     
     # Try to initialize Firebase
     try:
-        # Get credentials from environment or secrets
-        creds_json = firebase_creds_env or firebase_creds_secret
-        creds_path = firebase_path_env or firebase_path_secret
-        
-        if not creds_json and not creds_path:
-            print("\n❌ No Firebase credentials found in environment or secrets.")
-            return False
-            
-        if creds_json:
-            print("\nUsing Firebase credentials from environment/secrets JSON...")
-            # Create temporary file for the credentials
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, mode='w') as temp_file:
-                if isinstance(creds_json, str):
-                    temp_file.write(creds_json)
-                else:
-                    json.dump(creds_json, temp_file)
-                temp_file_path = temp_file.name
-                
-            # Initialize Firebase with the temp file
-            cred = credentials.Certificate(temp_file_path)
-            
-            # Delete the temporary file
-            os.unlink(temp_file_path)
-        else:
-            print(f"\nUsing Firebase credentials from file path: {creds_path}")
-            cred = credentials.Certificate(creds_path)
-        
-        # Initialize Firebase app if not already initialized
+        # Initialize Firebase app if not already initialized; the
+        # credentials are only parsed when a new app is needed
         try:
             firebase_admin.get_app()
+            print("\nUsing the already initialized Firebase app...")
         except ValueError:
+            # Get credentials from environment or secrets
+            creds_json = firebase_creds_env or firebase_creds_secret
+            creds_path = firebase_path_env or firebase_path_secret
+            
+            if not creds_json and not creds_path:
+                print("\n❌ No Firebase credentials found in environment or secrets.")
+                return False
+                
+            if creds_json:
+                print("\nUsing Firebase credentials from environment/secrets JSON...")
+                # Certificate accepts the service account info directly, so the
+                # credentials are never written to disk
+                creds_dict = json.loads(creds_json) if isinstance(creds_json, str) else dict(creds_json)
+                cred = credentials.Certificate(creds_dict)
+            else:
+                print(f"\nUsing Firebase credentials from file path: {creds_path}")
+                cred = credentials.Certificate(creds_path)
+            
             firebase_admin.initialize_app(cred)
         
-        # Test Firestore connection
+        # Test Firestore connection with a single document read (listing the
+        # collections pages through all of them); the document need not exist
         db = firestore.client()
-        collections = [col.id for col in db.collections()]
+        db.collection(HEALTHCHECK_COLLECTION).document("ping").get(timeout=HEALTHCHECK_TIMEOUT)
         
         print("\n✅ Successfully connected to Firebase Firestore!")
-        print(f"Available collections: {collections if collections else 'No collections found'}")
+        print(f"Project: {db.project}")
         return True
         
     except Exception as e: